@@ -1,5 +1,7 @@
 import itertools
 import random
+from multiprocessing import Pool
+from graph_io import undirected_bitsets
 
 # check if a subset of vertices forms a clique
 def is_clique(graph, vertices):
@@ -8,8 +10,95 @@ def is_clique(graph, vertices):
             return False
     return True
 
+def _iter_bits(bits):
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+# Worker state, set once per process by init_worker
+_forward = None
+_k = None
+
+def init_worker(forward, k):
+    global _forward, _k
+    _forward, _k = forward, k
+
+# Higher-numbered neighbours of each vertex: every clique is found once, from its smallest vertex
+def forward_bitsets(adj):
+    return [bits >> (v + 1) << (v + 1) for v, bits in enumerate(adj)]
+
+# Grow clique through common neighbours; candidates only holds vertices above clique[-1]
+def _extend_clique(forward, clique, candidates, k):
+    if candidates.bit_count() < k - len(clique):
+        return  # too few common neighbours left to reach size k
+    if len(clique) == k - 1:
+        for v in _iter_bits(candidates):
+            yield tuple(clique) + (v,)
+        return
+    for v in _iter_bits(candidates):
+        clique.append(v)
+        yield from _extend_clique(forward, clique, forward[v] & candidates, k)
+        clique.pop()
+
+def _count_extensions(forward, size, candidates, k):
+    if candidates.bit_count() < k - size:
+        return 0
+    if size == k - 1:
+        return candidates.bit_count()
+    total = 0
+    for v in _iter_bits(candidates):
+        total += _count_extensions(forward, size + 1, forward[v] & candidates, k)
+    return total
+
+def cliques_from_vertex(v):
+    """Helper function to list the k-cliques whose smallest vertex is v"""
+    return list(_extend_clique(_forward, [v], _forward[v], _k))
+
+def count_from_vertex(v):
+    """Helper function to count the k-cliques whose smallest vertex is v"""
+    return _count_extensions(_forward, 1, _forward[v], _k)
+
+# Stream all cliques of size k in lexicographic order
+def iter_cliques(graph, k, num_processes=None):
+    """Yield every k-clique as a sorted tuple, in the order find_cliques lists them.
+
+    With num_processes, the work is split by smallest vertex across a
+    process pool and each vertex's cliques are yielded as soon as its
+    turn in the order comes.
+    """
+    forward = forward_bitsets(undirected_bitsets(graph))
+    if k <= 1:
+        yield from itertools.combinations(range(len(forward)), max(k, 0))
+        return
+    # A vertex with fewer than k - 1 forward neighbours cannot start a k-clique
+    starts = [v for v, bits in enumerate(forward) if bits.bit_count() >= k - 1]
+    if num_processes is None:
+        for v in starts:
+            yield from _extend_clique(forward, [v], forward[v], k)
+        return
+    with Pool(processes=num_processes, initializer=init_worker, initargs=(forward, k)) as pool:
+        # imap keeps the vertex order, so the stream stays lexicographic
+        for cliques in pool.imap(cliques_from_vertex, starts):
+            yield from cliques
+
+# Number of cliques of size k, without building them
+def count_cliques(graph, k, num_processes=None):
+    forward = forward_bitsets(undirected_bitsets(graph))
+    if k <= 1:
+        return len(forward) if k == 1 else int(k == 0)
+    starts = [v for v, bits in enumerate(forward) if bits.bit_count() >= k - 1]
+    if num_processes is None:
+        return sum(_count_extensions(forward, 1, forward[v], k) for v in starts)
+    with Pool(processes=num_processes, initializer=init_worker, initargs=(forward, k)) as pool:
+        return sum(pool.imap_unordered(count_from_vertex, starts))
+
 # find all cliques of size k
 def find_cliques(graph, k):
+    return list(iter_cliques(graph, k))
+
+# every k-subset tested with is_clique: the reference the clique engines are checked against
+def _brute_force_cliques(graph, k):
     n = len(graph)
     cliques = []
     
@@ -20,18 +109,99 @@ def find_cliques(graph, k):
     
     return cliques
 
-# find the maximum clique in the graph
-def find_max_clique(graph):
+# find the maximum clique by checking every subset, largest first
+def brute_force_max_clique(graph):
     n = len(graph)
     
     # Start by checking cliques from the largest possible size down to 1
     for k in range(n, 0, -1):
-        cliques = find_cliques(graph, k)
+        cliques = _brute_force_cliques(graph, k)
         if cliques:  # If we found cliques of size k
             return cliques[0]  # Return the first found clique (any clique of this size)
     
     return None
 
+# order vertices by repeatedly removing one of minimum remaining degree (bucket queue, O(n + m))
+def degeneracy_order(adj):
+    n = len(adj)
+    neighbours = [list(_iter_bits(bits)) for bits in adj]
+    degree = [len(ws) for ws in neighbours]
+    buckets = [set() for _ in range(max(degree, default=0) + 1)]
+    for v in range(n):
+        buckets[degree[v]].add(v)
+
+    removed = [False] * n
+    order = []
+    d = 0
+    for _ in range(n):
+        # Removing a vertex lowers the minimum degree by at most one
+        d = max(d - 1, 0)
+        while not buckets[d]:
+            d += 1
+        v = buckets[d].pop()
+        removed[v] = True
+        order.append(v)
+        for w in neighbours[v]:
+            if not removed[w]:
+                buckets[degree[w]].remove(w)
+                degree[w] -= 1
+                buckets[degree[w]].add(w)
+    return order
+
+# number of colours a greedy colouring of candidates uses: an upper bound on any clique in it
+def greedy_colour_bound(adj, candidates):
+    colours = 0
+    uncoloured = candidates
+    while uncoloured:
+        colours += 1
+        # one colour class: an independent set picked greedily
+        available = uncoloured
+        while available:
+            v = (available & -available).bit_length() - 1
+            uncoloured &= ~(1 << v)
+            available &= ~adj[v] & ~(1 << v)
+    return colours
+
+# maximum clique: Bron-Kerbosch with Tomita pivoting, pruned by a colouring bound
+def max_clique(graph):
+    adj = undirected_bitsets(graph)
+    if not adj:
+        return None
+    best = []
+
+    def expand(clique, candidates, excluded):
+        nonlocal best
+        if not candidates:
+            if not excluded and len(clique) > len(best):
+                best = list(clique)
+            return
+        if len(clique) + greedy_colour_bound(adj, candidates) <= len(best):
+            return
+        # Tomita pivot: the vertex covering most candidates; only its non-neighbours branch
+        pivot = max(_iter_bits(candidates | excluded), key=lambda u: (adj[u] & candidates).bit_count())
+        for v in _iter_bits(candidates & ~adj[pivot]):
+            clique.append(v)
+            expand(clique, candidates & adj[v], excluded & adj[v])
+            clique.pop()
+            candidates &= ~(1 << v)
+            excluded |= 1 << v
+            if len(clique) + candidates.bit_count() <= len(best):
+                return
+
+    # Outer loop in degeneracy order keeps every candidate set small
+    done = 0
+    for v in degeneracy_order(adj):
+        later = adj[v] & ~done
+        if 1 + later.bit_count() > len(best):
+            expand([v], later, adj[v] & done)
+        done |= 1 << v
+
+    return tuple(sorted(best))
+
+# find the maximum clique in the graph
+def find_max_clique(graph):
+    return max_clique(graph)
+
 if __name__ == "__main__":
     n = int(input("Enter the number of vertices in the graph: "))
     
@@ -63,9 +233,9 @@ if __name__ == "__main__":
         print("No cliques found.")
     
     # Find the maximum clique
-    max_clique = find_max_clique(graph)
+    largest = find_max_clique(graph)
     print("\nMaximum Clique:")
-    if max_clique:
-        print(max_clique)
+    if largest:
+        print(largest)
     else:
         print("No maximum clique found.")
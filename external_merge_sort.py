@@ -0,0 +1,107 @@
+import os
+import tempfile
+import numpy as np
+from multiprocessing import Pool, cpu_count
+from kway_merge import numpy_merge
+
+# Sort one RAM-sized run of the input file and spill it to a temp file
+def sort_run(task):
+    """Helper function to sort runs of the memory-mapped input in parallel"""
+    input_path, dtype, start, stop, run_path = task
+    data = np.memmap(input_path, dtype=dtype, mode='r')
+    run = np.array(data[start:stop])  # one copy in RAM, sorted in place
+    del data
+    run.sort()
+    run.tofile(run_path)
+    return run_path
+
+# Buffered k-way merge of sorted run files using at most buffer_items elements
+def merge_run_files(run_paths, output_path, dtype, buffer_items):
+    dtype = np.dtype(dtype)
+    readers = [np.memmap(path, dtype=dtype, mode='r')
+               for path in run_paths if os.path.getsize(path) > 0]
+    # Half the budget holds the input blocks, the other half the merged output
+    block = max(1, buffer_items // (2 * max(1, len(readers))))
+    positions = [0] * len(readers)
+    buffers = [None] * len(readers)
+
+    def refill(i):
+        start = positions[i]
+        positions[i] = min(start + block, len(readers[i]))
+        buffers[i] = np.array(readers[i][start:positions[i]])
+
+    for i in range(len(readers)):
+        refill(i)
+
+    with open(output_path, 'wb') as out:
+        while readers:
+            # Everything up to the smallest buffered tail is safe to emit
+            bound = min(buf[-1] for buf in buffers)
+            heads = []
+            for i, buf in enumerate(buffers):
+                cut = np.searchsorted(buf, bound, side='right')
+                heads.append(buf[:cut])
+                buffers[i] = buf[cut:]
+            numpy_merge(heads).tofile(out)
+            del heads
+
+            # Refill drained buffers and drop exhausted runs
+            for i in reversed(range(len(readers))):
+                if len(buffers[i]) == 0:
+                    if positions[i] < len(readers[i]):
+                        refill(i)
+                    else:
+                        del readers[i], positions[i], buffers[i]
+
+    return output_path
+
+def _merge_group(task):
+    run_paths, output_path, dtype, buffer_items = task
+    merge_run_files(run_paths, output_path, dtype, buffer_items)
+    for path in run_paths:
+        os.remove(path)
+    return output_path
+
+# External merge sort of a binary file of fixed-width numbers
+def external_merge_sort(input_path, output_path, dtype=np.int64,
+                        memory_budget=256 * 1024 * 1024, fan_in=16,
+                        num_processes=None, tmp_dir=None):
+    """Sort a raw binary file that may be larger than RAM.
+
+    memory_budget (bytes) is shared by all workers: it bounds the size of
+    the sorted runs and the merge buffers. fan_in is the maximum number of
+    runs merged at once; more runs than that take extra merge passes.
+    """
+    if num_processes is None:
+        num_processes = cpu_count()
+    if fan_in < 2:
+        raise ValueError("fan_in must be at least 2")
+    dtype = np.dtype(dtype)
+
+    total = os.path.getsize(input_path) // dtype.itemsize
+    budget_items = max(2, memory_budget // dtype.itemsize)
+
+    with tempfile.TemporaryDirectory(dir=tmp_dir) as tmp:
+        # Phase 1: sort RAM-sized runs in parallel, one run per worker at a time
+        run_len = max(1, budget_items // num_processes)
+        tasks = [(input_path, dtype.str, start, min(start + run_len, total),
+                  os.path.join(tmp, f"run0_{i}.bin"))
+                 for i, start in enumerate(range(0, total, run_len))]
+
+        with Pool(processes=num_processes) as pool:
+            runs = pool.map(sort_run, tasks)
+
+            # Phase 2: merge fan_in runs at a time until few enough remain
+            merge_pass = 1
+            while len(runs) > fan_in:
+                groups = [runs[i:i + fan_in] for i in range(0, len(runs), fan_in)]
+                group_budget = budget_items // min(num_processes, len(groups))
+                tasks = [(group, os.path.join(tmp, f"run{merge_pass}_{i}.bin"), dtype.str, group_budget)
+                         for i, group in enumerate(groups)]
+                runs = pool.map(_merge_group, tasks)
+                merge_pass += 1
+
+        # Final pass writes straight to the output file
+        merge_run_files(runs, output_path, dtype, budget_items)
+
+    return output_path
@@ -1,6 +1,12 @@
 import time
+from collections import OrderedDict
 import matplotlib.pyplot as plt
 
+# Results kept across calls to fib(); big-int F(n) has about 0.7 * n bits, so keep it bounded
+FIB_CACHE_SIZE = 1024
+# In fib_batch, gaps up to this size are walked by addition instead of a fresh doubling
+BATCH_STEP_LIMIT = 64
+
 # Normal Fibonacci function
 def fibonacci(n):
     if n == 0:
@@ -23,37 +29,128 @@ def fib_memo(n, memo):
     memo[n] = result
     return result
 
-# Performance comparison
-n_values = [4, 6, 8, 10, 12, 14]  # Test cases
-normal_times = []
-memo_times = []
-normal_fibs = []
-memo_fibs = []
-
-for n in n_values:
-    # Measure time for normal Fibonacci
-    start = time.time()
-    normal_fib = fibonacci(n)
-    end = time.time()
-    normal_times.append(end - start)
-    normal_fibs.append(normal_fib)
-
-    # Measure time for Fibonacci with memoization (clear memo for each n)
-    start = time.time()
-    memo_fib = fib_memo(n, {})  # Pass an empty dictionary each time
-    end = time.time()
-    memo_times.append(end - start)
-    memo_fibs.append(memo_fib)
-
-    print(f"n = {n}: F(n) = {normal_fib} | t = {normal_times[-1]:.6f}s || MF(n)= {memo_fib} | t = {memo_times[-1]:.6f}s")
-
-# Plotting the results
-plt.figure(figsize=(10, 6))
-plt.plot(n_values, normal_times, label="Normal Fibonacci", marker="o")
-plt.plot(n_values, memo_times, label="Memoized Fibonacci", marker="o")
-plt.xlabel("n (Fibonacci Index)")
-plt.ylabel("Execution Time (seconds)")
-plt.title("Performance Comparison: Normal vs Memoized Fibonacci")
-plt.legend()
-plt.grid()
-plt.show()
+# Fast doubling: (F(n), F(n+1)) in O(log n) multiplications, reduced mod m if given
+def fib_pair(n, mod=None):
+    a, b = 0, 1  # F(0), F(1)
+    for bit in bin(n)[2:]:
+        # F(2k) = F(k) * (2F(k+1) - F(k)),  F(2k+1) = F(k)^2 + F(k+1)^2
+        c = a * (2 * b - a)
+        d = a * a + b * b
+        if mod is not None:
+            c, d = c % mod, d % mod
+        if bit == '1':
+            a, b = d, c + d
+            if mod is not None:
+                b %= mod
+        else:
+            a, b = c, d
+    return a, b
+
+# F(n) results keyed by (n, mod), least recently used first; shared by fib and fib_batch
+_fib_cache = OrderedDict()
+
+def _cache_get(n, mod):
+    value = _fib_cache.get((n, mod))
+    if value is not None:
+        _fib_cache.move_to_end((n, mod))
+    return value
+
+def _cache_put(n, mod, value):
+    _fib_cache[(n, mod)] = value
+    _fib_cache.move_to_end((n, mod))
+    if len(_fib_cache) > FIB_CACHE_SIZE:
+        _fib_cache.popitem(last=False)
+
+def _check_args(n, mod):
+    if n < 0:
+        raise ValueError("n must be non-negative")
+    if mod is not None and mod < 1:
+        raise ValueError("mod must be a positive integer")
+
+# Fibonacci number F(n), or F(n) mod m; results are shared across calls
+def fib(n, mod=None):
+    _check_args(n, mod)
+    n = int(n)
+    value = _cache_get(n, mod)
+    if value is None:
+        value = fib_pair(n, mod)[0]
+        _cache_put(n, mod, value)
+    return value
+
+# F(n) for many n at once, returned in input order; reads and fills fib's cache
+def fib_batch(ns, mod=None):
+    ns = [int(n) for n in ns]
+    for n in ns:
+        _check_args(n, mod)
+    results = {}
+    prev, pair = None, None
+    for n in sorted(set(ns)):
+        value = _cache_get(n, mod)
+        if value is not None:
+            results[n] = value
+            # Both F(n) and F(n+1) cached: later gaps can step from here
+            following = _cache_get(n + 1, mod)
+            if following is not None:
+                prev, pair = n, (value, following)
+            continue
+        if prev is not None and n - prev <= BATCH_STEP_LIMIT:
+            # Close to the last one: step forward instead of starting over
+            a, b = pair
+            for _ in range(n - prev):
+                a, b = b, a + b
+                if mod is not None:
+                    b %= mod
+            pair = (a, b)
+        else:
+            pair = fib_pair(n, mod)
+        prev = n
+        results[n] = pair[0]
+        _cache_put(n, mod, pair[0])
+    return [results[n] for n in ns]
+
+def main():
+    # Performance comparison
+    n_values = [4, 6, 8, 10, 12, 14]  # Test cases
+    normal_times = []
+    memo_times = []
+    doubling_times = []
+    normal_fibs = []
+    memo_fibs = []
+
+    for n in n_values:
+        # Measure time for normal Fibonacci
+        start = time.time()
+        normal_fib = fibonacci(n)
+        end = time.time()
+        normal_times.append(end - start)
+        normal_fibs.append(normal_fib)
+
+        # Measure time for Fibonacci with memoization (clear memo for each n)
+        start = time.time()
+        memo_fib = fib_memo(n, {})  # Pass an empty dictionary each time
+        end = time.time()
+        memo_times.append(end - start)
+        memo_fibs.append(memo_fib)
+
+        # Measure time for fast doubling (skip the shared cache so every n is computed)
+        start = time.time()
+        doubling_fib = fib_pair(n)[0]
+        doubling_times.append(time.time() - start)
+        assert doubling_fib == normal_fib
+
+        print(f"n = {n}: F(n) = {normal_fib} | t = {normal_times[-1]:.6f}s || MF(n)= {memo_fib} | t = {memo_times[-1]:.6f}s")
+
+    # Plotting the results
+    plt.figure(figsize=(10, 6))
+    plt.plot(n_values, normal_times, label="Normal Fibonacci", marker="o")
+    plt.plot(n_values, memo_times, label="Memoized Fibonacci", marker="o")
+    plt.plot(n_values, doubling_times, label="Fast Doubling Fibonacci", marker="o")
+    plt.xlabel("n (Fibonacci Index)")
+    plt.ylabel("Execution Time (seconds)")
+    plt.title("Performance Comparison: Normal vs Memoized vs Fast Doubling Fibonacci")
+    plt.legend()
+    plt.grid()
+    plt.show()
+
+if __name__ == "__main__":
+    main()
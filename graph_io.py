@@ -0,0 +1,189 @@
+import numpy as np
+
+# File layout: a 40-byte header of little-endian uint64s (magic, kind, n, edges,
+# index itemsize) followed by the raw arrays, so loading is just np.memmap
+GRAPH_MAGIC = int.from_bytes(b"LAB3GRPH", "little")
+HEADER_FIELDS = 5
+HEADER_BYTES = 8 * HEADER_FIELDS
+CSR_KIND = 0
+PACKED_KIND = 1
+
+class CSRGraph:
+    """Sparse adjacency in CSR form: the out-neighbours of u are indices[indptr[u]:indptr[u + 1]].
+
+    graph[u][v] works as it does for a dense matrix, so is_clique and
+    is_hamiltonian_cycle accept a CSRGraph unchanged.
+    """
+
+    def __init__(self, indptr, indices):
+        self.indptr = indptr
+        self.indices = indices
+        self.n = len(indptr) - 1
+
+    def __len__(self):
+        return self.n
+
+    def neighbours(self, u):
+        return self.indices[self.indptr[u]:self.indptr[u + 1]]
+
+    def __getitem__(self, u):
+        return _CSRRow(self.neighbours(u), self.n)
+
+    @property
+    def num_edges(self):
+        return int(self.indptr[-1])
+
+class _CSRRow:
+    """One row of a CSRGraph read like a dense 0/1 row; neighbours are sorted"""
+
+    def __init__(self, neighbours, n):
+        self.neighbours = neighbours
+        self.n = n
+
+    def __len__(self):
+        return self.n
+
+    def __getitem__(self, v):
+        i = np.searchsorted(self.neighbours, v)
+        return int(i < len(self.neighbours) and self.neighbours[i] == v)
+
+    def __iter__(self):
+        row = np.zeros(self.n, dtype=np.int8)
+        row[self.neighbours] = 1
+        return iter(row.tolist())
+
+class PackedGraph:
+    """Dense adjacency with each row bit-packed (bit v of byte v // 8, little-endian)."""
+
+    def __init__(self, rows, n):
+        self.rows = rows
+        self.n = n
+
+    def __len__(self):
+        return self.n
+
+    def neighbours(self, u):
+        return np.flatnonzero(self[u])
+
+    def __getitem__(self, u):
+        return np.unpackbits(self.rows[u], count=self.n, bitorder='little')
+
+    @property
+    def num_edges(self):
+        return int(np.unpackbits(self.rows, axis=1, count=self.n, bitorder='little').sum())
+
+# Build a CSR graph from edge arrays, dropping self-loops and duplicate edges
+def csr_from_edges(n, src, dst, directed=False):
+    src = np.asarray(src, dtype=np.int64)
+    dst = np.asarray(dst, dtype=np.int64)
+    if not directed:
+        src, dst = np.concatenate([src, dst]), np.concatenate([dst, src])
+    keep = src != dst
+    src, dst = src[keep], dst[keep]
+    if len(src) and (min(src.min(), dst.min()) < 0 or max(src.max(), dst.max()) >= n):
+        raise ValueError(f"edge endpoints must lie in 0..{n - 1}")
+
+    # Sort by (src, dst) through one combined key, then drop repeats
+    key = np.unique(src * n + dst)
+    src, dst = key // n, key % n
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+    index_dtype = np.int32 if n <= np.iinfo(np.int32).max else np.int64
+    return CSRGraph(indptr, dst.astype(index_dtype))
+
+# Read a whitespace-separated "u v" edge list; extra columns (weights) are ignored
+def read_edge_list(path, num_vertices=None, directed=False, comments='#'):
+    edges = np.loadtxt(path, dtype=np.int64, comments=comments, usecols=(0, 1), ndmin=2)
+    src, dst = edges[:, 0], edges[:, 1]
+    if num_vertices is None:
+        num_vertices = int(edges.max()) + 1 if len(edges) else 0
+    return csr_from_edges(num_vertices, src, dst, directed)
+
+# (n, src, dst) for every edge u -> v with u != v, from any supported representation
+def edge_arrays(graph):
+    n = len(graph)
+    if isinstance(graph, CSRGraph):
+        src = np.repeat(np.arange(n, dtype=np.int64), np.diff(graph.indptr))
+        dst = np.asarray(graph.indices, dtype=np.int64)
+    elif isinstance(graph, PackedGraph):
+        src, dst = np.nonzero(np.unpackbits(graph.rows, axis=1, count=n, bitorder='little'))
+    else:
+        src, dst = np.nonzero(np.asarray(graph).reshape(n, n) != 0)
+    keep = src != dst
+    return n, src[keep], dst[keep]
+
+# Python-int bitset of dst per src; each row is packed only up to its highest target
+def _bitsets_from_edges(n, src, dst):
+    order = np.argsort(src, kind='stable')
+    src, dst = src[order], dst[order]
+    cuts = np.searchsorted(src, np.arange(n + 1)).tolist()
+    row = np.zeros(n, dtype=bool)
+    bits = [0] * n
+    for u in range(n):
+        targets = dst[cuts[u]:cuts[u + 1]]
+        if len(targets):
+            width = int(targets.max()) + 1
+            row[targets] = True
+            bits[u] = int.from_bytes(np.packbits(row[:width], bitorder='little').tobytes(), 'little')
+            row[targets] = False
+    return bits
+
+# out/in neighbour bitsets: bit v of out_bits[u] is set for an edge u -> v
+def adjacency_bitsets(graph):
+    n, src, dst = edge_arrays(graph)
+    return _bitsets_from_edges(n, src, dst), _bitsets_from_edges(n, dst, src)
+
+# undirected neighbour bitsets, reading edge u-v from graph[min][max] as is_clique does
+def undirected_bitsets(graph):
+    n, src, dst = edge_arrays(graph)
+    upper = src < dst
+    src, dst = src[upper], dst[upper]
+    return _bitsets_from_edges(n, np.concatenate([src, dst]), np.concatenate([dst, src]))
+
+# Write a graph in the binary format; packed is chosen when it is the smaller file
+def write_graph(graph, path, packed=None):
+    n, src, dst = edge_arrays(graph)
+    row_bytes = -(-n // 8)
+    if packed is None:
+        packed = n * row_bytes < 8 * (n + 1) + 4 * len(src)
+
+    if packed:
+        rows = np.zeros((n, n), dtype=bool)
+        rows[src, dst] = True
+        header = [GRAPH_MAGIC, PACKED_KIND, n, len(src), 1]
+        arrays = [np.packbits(rows, axis=1, bitorder='little')]
+    else:
+        csr = csr_from_edges(n, src, dst, directed=True)
+        indices = csr.indices.astype(csr.indices.dtype.newbyteorder('<'))
+        header = [GRAPH_MAGIC, CSR_KIND, n, csr.num_edges, indices.dtype.itemsize]
+        arrays = [csr.indptr.astype('<i8'), indices]
+
+    with open(path, 'wb') as out:
+        np.array(header, dtype='<u8').tofile(out)
+        for array in arrays:
+            array.tofile(out)
+    return path
+
+# Map a graph file written by write_graph; nothing is parsed or copied up front
+def load_graph(path):
+    magic, kind, n, edges, itemsize = (int(x) for x in np.fromfile(path, dtype='<u8', count=HEADER_FIELDS))
+    if magic != GRAPH_MAGIC:
+        raise ValueError(f"{path} is not a graph file")
+    if kind == PACKED_KIND:
+        rows = np.memmap(path, dtype=np.uint8, mode='r', offset=HEADER_BYTES, shape=(n, -(-n // 8)))
+        return PackedGraph(rows, n)
+    if kind == CSR_KIND:
+        indptr = np.memmap(path, dtype='<i8', mode='r', offset=HEADER_BYTES, shape=(n + 1,))
+        indices = np.memmap(path, dtype=f'<i{itemsize}', mode='r',
+                            offset=HEADER_BYTES + 8 * (n + 1), shape=(edges,))
+        return CSRGraph(indptr, indices)
+    raise ValueError(f"unknown graph kind {kind} in {path}")
+
+if __name__ == "__main__":
+    edge_path = input("Enter the path of the edge list: ")
+    graph_path = input("Enter the path for the binary graph file: ")
+
+    graph = read_edge_list(edge_path)
+    write_graph(graph, graph_path)
+    loaded = load_graph(graph_path)
+    print(f"{type(loaded).__name__}: {len(loaded)} vertices, {loaded.num_edges} directed edges")
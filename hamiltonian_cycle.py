@@ -1,5 +1,7 @@
 import itertools
 import random
+import numpy as np
+from graph_io import adjacency_bitsets
 
 # check if a given path forms a Hamiltonian cycle
 def is_hamiltonian_cycle(graph, path):
@@ -26,6 +28,244 @@ def brute_force_hamiltonian_cycle(graph):
     
     return best_path
 
+# the subset DP needs 2^(n-1) table entries (4 bytes each); 26 vertices is ~128 MiB
+DP_MAX_VERTICES = 26
+
+def _iter_bits(bits):
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+# vertices reachable from start over the given bitset adjacency
+def _reachable(bits, start):
+    seen = frontier = 1 << start
+    while frontier:
+        step = 0
+        for v in _iter_bits(frontier):
+            step |= bits[v]
+        frontier = step & ~seen
+        seen |= frontier
+    return seen
+
+# True unless the (undirected) graph on alive is connected with no cut vertex: iterative Tarjan
+def _not_biconnected(und_bits, alive):
+    disc = {}
+    low = {}
+    root = (alive & -alive).bit_length() - 1
+
+    def neighbours(v):
+        return und_bits[v] & alive
+
+    disc[root] = low[root] = 0
+    root_children = 0
+    stack = [(root, -1, neighbours(root))]
+    while stack:
+        v, parent, pending = stack[-1]
+        if pending:
+            w = (pending & -pending).bit_length() - 1
+            stack[-1] = (v, parent, pending & (pending - 1))
+            if w not in disc:
+                disc[w] = low[w] = len(disc)
+                if v == root:
+                    root_children += 1
+                stack.append((w, v, neighbours(w)))
+            elif w != parent:
+                low[v] = min(low[v], disc[w])
+        else:
+            stack.pop()
+            if parent != -1:
+                low[parent] = min(low[parent], low[v])
+                if parent != root and low[v] >= disc[parent]:
+                    return True
+    return root_children > 1 or len(disc) != alive.bit_count()
+
+# cheap necessary conditions; returns the reason a cycle cannot exist, or None
+def hamiltonian_infeasible(out_bits, in_bits):
+    n = len(out_bits)
+    for v in range(n):
+        if not out_bits[v] or not in_bits[v] or (out_bits[v] | in_bits[v]).bit_count() < 2:
+            return f"vertex {v} has degree < 2"
+    full = (1 << n) - 1
+    if _reachable(out_bits, 0) != full or _reachable(in_bits, 0) != full:
+        return "graph is not strongly connected"
+    if _not_biconnected([out_bits[v] | in_bits[v] for v in range(n)], full):
+        return "graph has a cut vertex"
+    return None
+
+# depth-first path extension from a start vertex with bitset pruning
+def backtrack_hamiltonian_cycle(out_bits, in_bits, node_limit=None, start=0):
+    """Returns (cycle or None, finished); finished is False if node_limit ran out.
+
+    The cycle is built from start and returned rotated to begin at vertex 0.
+    """
+    n = len(out_bits)
+    full = (1 << n) - 1
+    home = 1 << start
+
+    def next_moves(v, visited):
+        """Vertices to try after v, most constrained last; empty if the path is dead"""
+        remaining = full & ~visited
+        # the start must still be enterable to close the cycle
+        if not in_bits[start] & remaining:
+            return []
+        way_in = remaining | (1 << v)
+        way_out = remaining | home
+        # path neighbours still free: two for unvisited vertices, one for each end of the path
+        free = {v: 1, start: 1} if v != start else {start: 2}
+        forced = closing = 0
+        pred_claimed = succ_claimed = 0
+        for u in _iter_bits(remaining):
+            ins = in_bits[u] & way_in
+            outs = out_bits[u] & way_out
+            either = ins | outs
+            # every unvisited vertex needs a way in and a different way out
+            if not ins or not outs or either.bit_count() < 2:
+                return []
+            # a vertex with a single way in (out) claims that vertex's only successor (predecessor)
+            if not ins & (ins - 1):
+                if pred_claimed & ins:
+                    return []
+                pred_claimed |= ins
+                if ins == 1 << v:
+                    forced = 1 << u
+            if not outs & (outs - 1):
+                if succ_claimed & outs:
+                    return []
+                succ_claimed |= outs
+                if outs == home:
+                    closing = 1 << u
+            # exactly two candidates: both must be its neighbours on the path
+            if either.bit_count() == 2:
+                for x in _iter_bits(either):
+                    left = free.get(x, 2) - 1
+                    if left < 0:
+                        return []
+                    free[x] = left
+                if v != start:
+                    if either >> v & 1:
+                        forced = 1 << u  # it has to follow v
+                    if either & home:
+                        closing = 1 << u  # it has to come right before the start
+
+        # the rest of the path must be able to reach every unvisited vertex
+        seen = frontier = out_bits[v] & remaining
+        while frontier:
+            step = 0
+            for w in _iter_bits(frontier):
+                step |= out_bits[w]
+            frontier = step & remaining & ~seen
+            seen |= frontier
+        if seen != remaining:
+            return []
+
+        options = out_bits[v] & remaining
+        if forced:
+            options &= forced
+        elif closing and remaining != closing:
+            options &= ~closing  # the vertex that can only reach the start has to come last
+        # Warnsdorff's rule: fewest onward options first (pop() takes from the end)
+        moves = list(_iter_bits(options))
+        moves.sort(key=lambda u: (out_bits[u] & remaining).bit_count(), reverse=True)
+        return moves
+
+    path = [start]
+    visited = home
+    stack = [next_moves(start, visited)]
+    nodes = 0
+    while stack:
+        if not stack[-1]:
+            stack.pop()
+            visited ^= 1 << path.pop()
+            continue
+        u = stack[-1].pop()
+        nodes += 1
+        if node_limit is not None and nodes > node_limit:
+            return None, False
+
+        path.append(u)
+        visited |= 1 << u
+        if visited == full:
+            if out_bits[u] & home:
+                first = path.index(0)
+                return tuple(path[first:] + path[:first]), True
+        else:
+            moves = next_moves(u, visited)
+            if moves:
+                stack.append(moves)
+                continue
+        visited ^= 1 << path.pop()
+
+    return None, True
+
+# bitmask DP over subsets in O(n^2 * 2^n), vectorized one subset size at a time
+def dp_hamiltonian_cycle(out_bits, in_bits):
+    n = len(out_bits)
+    m = n - 1  # bit j stands for vertex j + 1; vertex 0 is the fixed start
+    if n > DP_MAX_VERTICES:
+        raise MemoryError(f"the subset DP is limited to {DP_MAX_VERTICES} vertices")
+    states = 1 << m
+    # bitset of vertices k with an edge k -> j, for every inner vertex j
+    preds = [np.uint32(in_bits[j + 1] >> 1) for j in range(m)]
+
+    # reach[mask]: bitset of end vertices j for paths 0 -> ... -> j covering mask
+    reach = np.zeros(states, dtype=np.uint32)
+    for j in range(m):
+        if out_bits[0] >> (j + 1) & 1:
+            reach[1 << j] = 1 << j
+
+    # push one subset size at a time, only from subsets some path actually covers
+    live = np.flatnonzero(reach).astype(np.int32)
+    touched = np.zeros(states, dtype=bool)
+    for size in range(1, m):
+        for j in range(m):
+            masks = live[(live >> j) & 1 == 0]
+            masks = masks[(reach[masks] & preds[j]) != 0] | (1 << j)
+            reach[masks] |= np.uint32(1 << j)
+            touched[masks] = True
+        live = np.flatnonzero(touched).astype(np.int32)
+        if not len(live):
+            return None
+        touched[live] = False
+
+    full = states - 1
+    ends = int(reach[full]) & (in_bits[0] >> 1)
+    if not ends:
+        return None
+
+    # walk back through the table
+    j = (ends & -ends).bit_length() - 1
+    mask = full
+    path = []
+    while True:
+        path.append(j + 1)
+        mask ^= 1 << j
+        if not mask:
+            break
+        options = int(reach[mask]) & (in_bits[j + 1] >> 1)
+        j = (options & -options).bit_length() - 1
+    path.append(0)
+    return tuple(reversed(path))
+
+# find a Hamiltonian cycle: quick rejection, then backtracking, then the subset DP
+def find_hamiltonian_cycle(graph, node_limit=50000):
+    n = len(graph)
+    if n <= 2:
+        return brute_force_hamiltonian_cycle(graph)
+
+    out_bits, in_bits = adjacency_bitsets(graph)
+    if hamiltonian_infeasible(out_bits, in_bits):
+        return None
+
+    # past the DP's size limit, backtracking runs to completion
+    limit = node_limit if n <= DP_MAX_VERTICES else None
+    # start from the vertex with the fewest neighbours: the fewest first branches
+    start = min(range(n), key=lambda v: (out_bits[v] | in_bits[v]).bit_count())
+    cycle, finished = backtrack_hamiltonian_cycle(out_bits, in_bits, limit, start)
+    if finished:
+        return cycle
+    return dp_hamiltonian_cycle(out_bits, in_bits)
+
 if __name__ == "__main__":
     n = int(input("Enter the number of vertices in the graph: "))
     
@@ -37,7 +277,7 @@ if __name__ == "__main__":
         print(row)
     
     # find a cycle
-    cycle = brute_force_hamiltonian_cycle(graph)
+    cycle = find_hamiltonian_cycle(graph)
     
     if cycle:
         print(f"Hamiltonian cycle found: {cycle}")
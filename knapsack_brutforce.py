@@ -1,5 +1,17 @@
 import random
-from itertools import combinations
+import bisect
+from itertools import combinations, accumulate
+import numpy as np
+from multiprocessing import Pool, cpu_count
+
+# Largest n * W the DP table is used for (its choice rows take n * W / 8 bytes)
+DP_MAX_CELLS = 10**9
+# Largest capacity the DP is used for: its value row alone takes 8 * (W + 1) bytes
+DP_MAX_CAPACITY = 2 * 10**7
+# Meet-in-the-middle enumerates 2^(n/2) subsets per half
+MITM_MAX_ITEMS = 40
+# The Gray-code brute force scores 2^12 subsets of the lowest items per step with NumPy
+GRAY_BLOCK_BITS = 12
 
 def brute_force_knapsack(weights, values, max_weight):
     n = len(weights)
@@ -19,6 +31,282 @@ def brute_force_knapsack(weights, values, max_weight):
 
     return best_value, best_combination
 
+# 0/1 knapsack by dynamic programming over capacities, one NumPy update per item
+def dp_knapsack(weights, values, max_weight):
+    """Return (best_value, best_combination) like brute_force_knapsack, in O(n * W).
+
+    Weights and the capacity must be integers (ValueError otherwise), and
+    weights must be non-negative. Each item's row of take/skip decisions is
+    kept bit-packed (W / 8 bytes) and replayed backwards to recover the items.
+    """
+    n = len(weights)
+    if not all(float(w).is_integer() for w in list(weights) + [max_weight]):
+        raise ValueError("the knapsack DP needs integer weights and capacity")
+    if any(w < 0 for w in weights):
+        raise ValueError("weights must be non-negative")
+    if max_weight < 0:
+        return 0, []
+    capacity = int(max_weight)
+    values_array = np.asarray(values)
+    dtype = np.int64 if values_array.dtype.kind in 'iub' else np.float64
+
+    # best[c]: best value of the items so far within capacity c
+    best = np.zeros(capacity + 1, dtype=dtype)
+    choices = []
+    for i in range(n):
+        w, v = int(weights[i]), values[i]
+        if w > capacity or v <= 0:
+            choices.append(None)  # never worth taking
+            continue
+        # Right-hand side is computed from the previous row before best is overwritten
+        with_item = best[:capacity + 1 - w] + v
+        take = with_item > best[w:]
+        np.maximum(best[w:], with_item, out=best[w:])
+        choices.append(np.packbits(take))
+
+    # Walk the items backwards; bit c - w of row i says whether item i was taken at capacity c
+    combination = []
+    c = capacity
+    for i in reversed(range(n)):
+        row = choices[i]
+        if row is None:
+            continue
+        w = int(weights[i])
+        offset = c - w
+        if offset >= 0 and row[offset >> 3] >> (7 - (offset & 7)) & 1:
+            combination.append(i)
+            c = offset
+
+    best_value = best[capacity].item()
+    if not combination:
+        return best_value, []
+    return best_value, tuple(reversed(combination))
+
+# Items that can ever be part of an optimum: positive value and not heavier than the knapsack
+def _useful_items(weights, values, max_weight):
+    return [i for i in range(len(weights)) if values[i] > 0 and weights[i] <= max_weight]
+
+# 0/1 knapsack by depth-first branch and bound in value-density order
+def branch_and_bound_knapsack(weights, values, max_weight):
+    """Return (best_value, best_combination); the bound is the fractional (greedy) relaxation."""
+    if max_weight < 0:
+        return 0, []
+    # Best value per unit weight first; weightless items sort ahead of everything
+    items = sorted(_useful_items(weights, values, max_weight),
+                   key=lambda i: values[i] / weights[i] if weights[i] else float('inf'), reverse=True)
+    ws = [weights[i] for i in items]
+    vs = [values[i] for i in items]
+    n = len(items)
+    prefix_w = [0] + list(accumulate(ws))
+    prefix_v = [0] + list(accumulate(vs))
+
+    # Fractional bound from level i: whole items while they fit, then a fraction of the next
+    def upper_bound(i, value, room):
+        k = bisect.bisect_right(prefix_w, prefix_w[i] + room, i) - 1
+        bound = value + prefix_v[k] - prefix_v[i]
+        if k < n:
+            bound += vs[k] * (room - (prefix_w[k] - prefix_w[i])) / ws[k]
+        return bound, k
+
+    best_value, best_taken = 0, []
+    # Stack entries: (level, value so far, room left, items taken as a linked tuple)
+    stack = [(0, 0, max_weight, None)]
+    while stack:
+        i, value, room, taken = stack.pop()
+        bound, k = upper_bound(i, value, room)
+        if bound <= best_value:
+            continue
+        if k == n:
+            # Everything left fits: the bound is exact
+            best_value, best_taken = bound, (taken, list(range(i, n)))
+            continue
+        # The greedy prefix i..k-1 is a feasible completion too
+        greedy = value + prefix_v[k] - prefix_v[i]
+        if greedy > best_value:
+            best_value, best_taken = greedy, (taken, list(range(i, k)))
+        # Skip item i, or take it; taking is pushed last so it is tried first
+        stack.append((i + 1, value, room, taken))
+        if ws[i] <= room:
+            stack.append((i + 1, value + vs[i], room - ws[i], (taken, [i])))
+
+    chosen = []
+    while best_taken:
+        best_taken, levels = best_taken
+        chosen.extend(items[j] for j in levels)
+    if not chosen:
+        return best_value, []
+    return best_value, tuple(sorted(chosen))
+
+# Weight and value of every subset of the given items; bit j of the index selects items[j]
+def _subset_sums(weights, values, items):
+    total_w = np.zeros(1, dtype=np.int64)
+    total_v = np.zeros(1, dtype=np.asarray(values).dtype if len(values) else np.int64)
+    for i in items:
+        total_w = np.concatenate([total_w, total_w + weights[i]])
+        total_v = np.concatenate([total_v, total_v + values[i]])
+    return total_w, total_v
+
+# 0/1 knapsack by meet in the middle: about 2^(n/2) work per half
+def meet_in_the_middle_knapsack(weights, values, max_weight):
+    """Return (best_value, best_combination) for up to about 40 useful items."""
+    if max_weight < 0:
+        return 0, []
+    items = _useful_items(weights, values, max_weight)
+    half = len(items) // 2
+    left, right = items[:half], items[half:]
+    left_w, left_v = _subset_sums(weights, values, left)
+    right_w, right_v = _subset_sums(weights, values, right)
+
+    # Sort the right half by weight; a running maximum drops dominated subsets
+    order = np.argsort(right_w, kind='stable')
+    right_w = right_w[order]
+    best_so_far = np.maximum.accumulate(right_v[order])
+    # Index (into order) of the subset achieving each running maximum
+    is_record = np.empty(len(order), dtype=bool)
+    is_record[0] = True
+    is_record[1:] = best_so_far[1:] > best_so_far[:-1]
+    record_at = np.maximum.accumulate(np.where(is_record, np.arange(len(order)), 0))
+
+    # Binary-search the heaviest right subset that still fits next to each left subset
+    fits = left_w <= max_weight
+    left_masks = np.flatnonzero(fits)
+    pos = np.searchsorted(right_w, max_weight - left_w[fits], side='right') - 1
+    totals = left_v[fits] + best_so_far[pos]
+    winner = int(totals.argmax())
+
+    left_mask = int(left_masks[winner])
+    right_mask = int(order[record_at[pos[winner]]])
+    chosen = [left[j] for j in range(len(left)) if left_mask >> j & 1]
+    chosen += [right[j] for j in range(len(right)) if right_mask >> j & 1]
+    best_value = totals[winner].item()
+    if not chosen:
+        return best_value, []
+    return best_value, tuple(sorted(chosen))
+
+def _mask_items(mask):
+    return tuple(i for i in range(mask.bit_length()) if mask >> i & 1)
+
+# brute_force_knapsack's preference: more value, then fewer items, then the lexicographically smaller tuple
+def _beats(candidate, best):
+    value, mask = candidate
+    best_value, best_mask = best
+    if value != best_value:
+        return value > best_value
+    size, best_size = mask.bit_count(), best_mask.bit_count()
+    if size != best_size:
+        return size < best_size
+    return _mask_items(mask) < _mask_items(best_mask)
+
+def gray_code_search(task):
+    """Helper function to search every subset whose high bits equal one prefix"""
+    weights, values, max_weight, prefix, prefix_bits, block_bits = task
+    n = len(weights)
+    gray_bits = n - block_bits - prefix_bits
+
+    # Every subset of the lowest block_bits items, scored at once at each Gray step;
+    # rank orders same-size blocks lexicographically, as combinations() would
+    block_w, block_v = _subset_sums(weights, values, range(block_bits))
+    block_size = np.array([m.bit_count() for m in range(1 << block_bits)], dtype=np.int64)
+    rank = np.empty(1 << block_bits, dtype=np.int64)
+    rank[sorted(range(1 << block_bits), key=lambda m: (m.bit_count(), _mask_items(m)))] = np.arange(1 << block_bits)
+    tie_key = block_size << block_bits | rank
+    lightest, richest = block_w.min(), block_v.max()
+
+    # Start from the prefix's own items, with all Gray bits clear
+    high = prefix << (block_bits + gray_bits)
+    weight = sum(weights[i] for i in _mask_items(high))
+    value = sum(values[i] for i in _mask_items(high))
+    best = (0, 0)  # the empty knapsack
+    for step in range(1 << gray_bits):
+        if step:
+            # Gray code: step k flips the bit at k's lowest set bit, one item in or out
+            bit = (step & -step).bit_length() - 1
+            i = block_bits + bit
+            high ^= 1 << i
+            if high >> i & 1:
+                weight += weights[i]
+                value += values[i]
+            else:
+                weight -= weights[i]
+                value -= values[i]
+
+        room = max_weight - weight
+        if room < lightest or value + richest < best[0]:
+            continue
+        fits = np.flatnonzero(block_w <= room)
+        totals = block_v[fits] + value
+        top = totals.max()
+        ties = fits[totals == top]
+        low = int(ties[tie_key[ties].argmin()])
+        candidate = (top.item(), high | low)
+        if _beats(candidate, best):
+            best = candidate
+    return best
+
+# exhaustive knapsack over Gray-code order, split by high-bit prefix across processes
+def gray_code_knapsack(weights, values, max_weight, num_processes=None):
+    """Return exactly what brute_force_knapsack returns, including its tie-breaking.
+
+    Each Gray-code step adds or removes one item in O(1); the lowest
+    GRAY_BLOCK_BITS items are scored as one NumPy block at every step.
+    """
+    if num_processes is None:
+        num_processes = cpu_count()
+    n = len(weights)
+    block_bits = min(GRAY_BLOCK_BITS, n)
+    # About four prefixes per process, so uneven subtrees still balance
+    prefix_bits = min(n - block_bits, (4 * num_processes - 1).bit_length())
+    tasks = [(list(weights), list(values), max_weight, prefix, prefix_bits, block_bits)
+             for prefix in range(1 << prefix_bits)]
+
+    if len(tasks) == 1:
+        results = [gray_code_search(tasks[0])]
+    else:
+        with Pool(processes=num_processes) as pool:
+            results = pool.map(gray_code_search, tasks)
+
+    best = (0, 0)
+    for candidate in results:
+        if _beats(candidate, best):
+            best = candidate
+    best_value, mask = best
+    if best_value <= 0:
+        return 0, []
+    return best_value, _mask_items(mask)
+
+# exact 0/1 knapsack, picking DP, meet in the middle or branch and bound from n and W
+def knapsack(weights, values, max_weight, method='auto'):
+    """Return (best_value, best_combination) like brute_force_knapsack.
+
+    method is 'dp', 'mitm', 'bnb', 'brute', 'gray' or 'auto'. auto uses the DP when
+    the weights and capacity are integers, W <= DP_MAX_CAPACITY and n * W is
+    small enough, meet in the middle for at most MITM_MAX_ITEMS useful
+    items, and branch and bound otherwise.
+    """
+    if method == 'auto':
+        useful = len(_useful_items(weights, values, max_weight))
+        if useful == 0:
+            return 0, []  # nothing fits or nothing is worth packing
+        integral = all(float(w).is_integer() for w in list(weights) + [max_weight])
+        if (integral and max_weight <= DP_MAX_CAPACITY
+                and useful * (max_weight + 1) <= DP_MAX_CELLS):
+            method = 'dp'
+        elif useful <= MITM_MAX_ITEMS:
+            method = 'mitm'
+        else:
+            method = 'bnb'
+
+    solvers = {
+        'dp': dp_knapsack,
+        'mitm': meet_in_the_middle_knapsack,
+        'bnb': branch_and_bound_knapsack,
+        'brute': brute_force_knapsack,
+        'gray': gray_code_knapsack,
+    }
+    if method not in solvers:
+        raise ValueError(f"unknown knapsack method {method!r}")
+    return solvers[method](weights, values, max_weight)
+
 if __name__ == "__main__":
     n = int(input("Enter the number of items: "))
     
@@ -28,7 +316,9 @@ if __name__ == "__main__":
     
     max_weight = int(input("Enter the maximum weight the knapsack can carry: "))
     
-    best_value, best_combination = brute_force_knapsack(weights, values, max_weight)
+    best_value, best_combination = knapsack(weights, values, max_weight)
+    if n <= 20:
+        assert brute_force_knapsack(weights, values, max_weight)[0] == best_value
     
     # Output the result
     print(f"Best Value: {best_value}")
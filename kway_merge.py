@@ -0,0 +1,127 @@
+import heapq
+import numpy as np
+
+# Below this many elements the NumPy conversion costs more than it saves
+NUMPY_MERGE_THRESHOLD = 4096
+
+# Merge sorted runs with a binary heap: O(n log k), stable, no sentinels
+def heap_merge(arrays):
+    """Merge sorted sequences of any comparable items into one sorted list"""
+    return list(heapq.merge(*arrays))
+
+# Merge two sorted NumPy arrays into out in one vectorized pass
+def _merge_two_into(left, right, out):
+    # Ties go after the left run so the merge stays stable
+    positions = np.searchsorted(left, right, side='right') + np.arange(len(right))
+    from_left = np.ones(len(out), dtype=bool)
+    from_left[positions] = False
+    out[positions] = right
+    out[from_left] = left
+    return out
+
+def _merge_two(left, right):
+    return _merge_two_into(left, right, np.empty(len(left) + len(right), dtype=left.dtype))
+
+# Merge sorted NumPy arrays as a tournament of pairwise merges: log k rounds
+def numpy_merge(arrays):
+    """Merge sorted 1-D NumPy arrays of a common dtype into one sorted array"""
+    runs = [run for run in arrays if len(run)]
+    if not runs:
+        return np.empty(0, dtype=arrays[0].dtype if arrays else float)
+    while len(runs) > 1:
+        merged = [_merge_two(runs[i], runs[i + 1]) for i in range(0, len(runs) - 1, 2)]
+        if len(runs) % 2:
+            merged.append(runs[-1])
+        runs = merged
+    return runs[0]
+
+# Merge adjacent sorted runs of one buffer, ping-ponging through a scratch buffer
+def merge_runs(buf, bounds, scratch=None):
+    """Merge the sorted runs buf[bounds[i]:bounds[i + 1]] in log k rounds.
+
+    Only buf and one scratch array of the same size are touched, so no
+    per-run copies are made. Returns whichever of the two holds the result.
+    """
+    if scratch is None:
+        scratch = np.empty_like(buf)
+    src, dst = buf, scratch
+    bounds = list(bounds)
+
+    while len(bounds) > 2:
+        num_runs = len(bounds) - 1
+        merged_bounds = [bounds[0]]
+        for i in range(0, num_runs, 2):
+            lo = bounds[i]
+            if i + 1 < num_runs:
+                mid, hi = bounds[i + 1], bounds[i + 2]
+                _merge_two_into(src[lo:mid], src[mid:hi], dst[lo:hi])
+            else:
+                hi = bounds[i + 1]
+                dst[lo:hi] = src[lo:hi]
+            merged_bounds.append(hi)
+        bounds = merged_bounds
+        src, dst = dst, src
+
+    return src
+
+# Merge two index runs that are each sorted by keys[run]
+def _merge_index_two(keys, left, right):
+    # Ties go after the left run, which holds the earlier rows: the merge is stable
+    positions = np.searchsorted(keys[left], keys[right], side='right') + np.arange(len(right))
+    result = np.empty(len(left) + len(right), dtype=left.dtype)
+    from_left = np.ones(len(result), dtype=bool)
+    from_left[positions] = False
+    result[positions] = right
+    result[from_left] = left
+    return result
+
+# Merge argsort runs of consecutive chunks into one stable permutation
+def merge_sorted_indices(keys, runs):
+    """Merge index arrays, each sorting its own chunk of keys, in chunk order"""
+    runs = [run for run in runs if len(run)]
+    if not runs:
+        return np.empty(0, dtype=np.intp)
+    while len(runs) > 1:
+        merged = [_merge_index_two(keys, runs[i], runs[i + 1]) for i in range(0, len(runs) - 1, 2)]
+        if len(runs) % 2:
+            merged.append(runs[-1])
+        runs = merged
+    return runs[0]
+
+# Convert the runs to NumPy if that is exact: ndarrays already sharing one int or float
+# dtype, or plain sequences holding only ints (a mix with floats would round to float64)
+def _as_numeric_runs(arrays):
+    runs = []
+    for run in arrays:
+        if not isinstance(run, np.ndarray):
+            if not all(type(item) is int for item in run):
+                return None
+            run = np.asarray(run)
+            if run.dtype.kind not in 'iu':
+                return None  # too wide for any integer dtype
+        runs.append(run)
+    dtype = runs[0].dtype
+    if dtype.kind not in 'iuf' or any(run.dtype != dtype or run.ndim != 1 for run in runs):
+        return None
+    return runs
+
+# Merge sorted arrays into one
+def merge_sorted_arrays(arrays):
+    """Merge multiple sorted arrays into a single sorted array.
+
+    Always returns a list, whatever the input containers are or which merge
+    path runs; use numpy_merge directly to stay in NumPy.
+    """
+    arrays = [run for run in arrays if len(run)]
+    if not arrays:
+        return []
+
+    if sum(len(run) for run in arrays) >= NUMPY_MERGE_THRESHOLD:
+        runs = _as_numeric_runs(arrays)
+        if runs is not None:
+            return numpy_merge(runs).tolist()
+
+    # NumPy runs become lists first, so both paths yield plain Python scalars
+    arrays = [run.tolist() if isinstance(run, np.ndarray) else run for run in arrays]
+
+    return heap_merge(arrays)
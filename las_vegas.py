@@ -41,30 +41,142 @@ def print_board(board, n):
         print(" ".join(row)) 
     print("\n")
 
+# check a configuration in O(n) with column and diagonal counters
+def is_valid_fast(board, n):
+    cols = [0] * n
+    diag_sum = [0] * (2 * n - 1)  # queens on each r + c diagonal
+    diag_diff = [0] * (2 * n - 1)  # queens on each r - c + n - 1 diagonal
+    for r, c in enumerate(board):
+        cols[c] += 1
+        diag_sum[r + c] += 1
+        diag_diff[r - c + n - 1] += 1
+    return max(cols, default=0) <= 1 and max(diag_sum, default=0) <= 1 and max(diag_diff, default=0) <= 1
+
 # Las Vegas algorithm
-def las_vegas_nqueens(n):
+def las_vegas_nqueens(n, verbose=True, visualize=True):
     start_time = time.time()
     
     while True:
         # Randomly place queens (one per row)
         board = random.sample(range(n), n)  # Randomly permutes columns for each row
         
-        print("Current configuration:")
-        print_board(board, n)
+        if verbose:
+            print("Current configuration:")
+            print_board(board, n)
         
         # Check if the current configuration is valid
-        if is_valid(board, n):
+        if is_valid_fast(board, n):
             end_time = time.time()
             total_time = end_time - start_time
-            print("Valid Configuration Found using Las Vegas Algorithm.")
-            visualize_board(board, n)
+            if verbose:
+                print("Valid Configuration Found using Las Vegas Algorithm.")
+            if visualize:
+                visualize_board(board, n)
             return total_time
-        else:
+        elif verbose:
             print("Invalid Configuration, retrying...\n")
-            continue
 
+# Random column picks per row during the greedy placement before a conflicting one is accepted
+PLACEMENT_TRIES = 20
+
+# Min-conflicts repair: swap columns between rows while that lowers the diagonal conflicts
+def min_conflicts_nqueens(n, max_steps=None, verbose=False, visualize=False, seed=None):
+    """Return (board, total_time); board[r] is the column of the queen in row r.
+
+    The board is always a permutation, so columns never conflict and only
+    the two diagonal counters are tracked; each swap is scored in O(1).
+    A run that exceeds max_steps swaps (default 50 * n) restarts.
+    """
+    if n in (2, 3):
+        raise ValueError(f"there is no solution for n = {n}")
+    rng = random.Random(seed)
+    start_time = time.time()
+    if max_steps is None:
+        max_steps = 50 * n + 1000
+    offset = n - 1
+    restarts = 0
+    rand = rng.random  # int(rand() * k) is much cheaper than randrange in these hot loops
+
+    while True:
+        board = list(range(n))
+        diag_sum = [0] * (2 * n - 1)
+        diag_diff = [0] * (2 * n - 1)
+
+        # Greedy start: row r takes a random still-unused column whose diagonals are free
+        for r in range(n):
+            for _ in range(PLACEMENT_TRIES):
+                j = r + int(rand() * (n - r))
+                c = board[j]
+                if not diag_sum[r + c] and not diag_diff[r - c + offset]:
+                    break
+            board[r], board[j] = c, board[r]
+            diag_sum[r + c] += 1
+            diag_diff[r - c + offset] += 1
+
+        conflicted = [r for r in range(n)
+                      if diag_sum[r + board[r]] > 1 or diag_diff[r - board[r] + offset] > 1]
+        if verbose:
+            print(f"Greedy placement left {len(conflicted)} queens in conflict")
+
+        steps = 0
+        while conflicted and steps < max_steps:
+            steps += 1
+            # Pick a queen still in conflict (entries go stale as swaps fix them)
+            k = int(rand() * len(conflicted))
+            i = conflicted[k]
+            ci = board[i]
+            if diag_sum[i + ci] == 1 and diag_diff[i - ci + offset] == 1:
+                conflicted[k] = conflicted[-1]
+                conflicted.pop()
+                continue
+
+            j = int(rand() * n)
+            cj = board[j]
+            if j == i:
+                continue
+            # Take both queens off, compare their conflicts before and after the swap
+            diag_sum[i + ci] -= 1
+            diag_diff[i - ci + offset] -= 1
+            diag_sum[j + cj] -= 1
+            diag_diff[j - cj + offset] -= 1
+            before = (diag_sum[i + ci] + diag_diff[i - ci + offset]
+                      + diag_sum[j + cj] + diag_diff[j - cj + offset]
+                      + (i + ci == j + cj) + (i - ci == j - cj))
+            after = (diag_sum[i + cj] + diag_diff[i - cj + offset]
+                     + diag_sum[j + ci] + diag_diff[j - ci + offset]
+                     + (i + cj == j + ci) + (i - cj == j - ci))
+            if after < before:
+                board[i], board[j] = cj, ci
+                ci, cj = cj, ci
+            diag_sum[i + ci] += 1
+            diag_diff[i - ci + offset] += 1
+            diag_sum[j + cj] += 1
+            diag_diff[j - cj + offset] += 1
+            if after < before and (diag_sum[j + cj] > 1 or diag_diff[j - cj + offset] > 1):
+                conflicted.append(j)
+
+        if not conflicted:
+            break
+        restarts += 1
+        if verbose:
+            print(f"No solution after {steps} swaps, restarting")
+
+    total_time = time.time() - start_time
+    if verbose:
+        print(f"Valid Configuration Found using Min-Conflicts ({restarts} restarts).")
+        if n <= 40:
+            print_board(board, n)
+    if visualize:
+        visualize_board(board, n)
+    return board, total_time
+
+if __name__ == "__main__":
+    n = int(input("Enter the number of queens: "))
 
-n = int(input("Enter the number of queens: "))
+    # Random sampling only finishes for small boards
+    if n <= 10:
+        elapsed_time = las_vegas_nqueens(n)
+        print(f"\nTime taken to find a valid solution: {elapsed_time:.6f} seconds")
 
-elapsed_time = las_vegas_nqueens(n)
-print(f"\nTime taken to find a valid solution: {elapsed_time:.6f} seconds")
+    board, elapsed_time = min_conflicts_nqueens(n, verbose=n <= 40)
+    print(f"\nTime taken by min-conflicts: {elapsed_time:.6f} seconds")
@@ -1,6 +1,31 @@
 import random
 import time
+from math import gcd, prod
+import numpy as np
 import matplotlib.pyplot as plt
+from multiprocessing import Pool, cpu_count
+
+# Primes below this are used for trial division before any Miller-Rabin round
+TRIAL_DIVISION_LIMIT = 1000
+SMALL_PRIMES = [p for p in range(2, TRIAL_DIVISION_LIMIT)
+                if all(p % q for q in range(2, int(p ** 0.5) + 1))]
+SMALL_PRIME_SET = frozenset(SMALL_PRIMES)
+# One gcd against this product replaces a loop of trial divisions
+SMALL_PRIMES_PRODUCT = prod(SMALL_PRIMES)
+
+# Miller-Rabin with the first k prime bases is exact below these bounds
+DETERMINISTIC_BASES = [
+    (2047, [2]),
+    (1373653, [2, 3]),
+    (25326001, [2, 3, 5]),
+    (3215031751, [2, 3, 5, 7]),
+    (2152302898747, [2, 3, 5, 7, 11]),
+    (3474749660383, [2, 3, 5, 7, 11, 13]),
+    (341550071728321, [2, 3, 5, 7, 11, 13, 17]),
+    (3825123056546413051, [2, 3, 5, 7, 11, 13, 17, 19, 23]),
+    (318665857834031151167461, [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37]),
+    (3317044064679887385961981, [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41]),
+]
 
 # Fermat's Primality Test
 def fermat_test(n, k):
@@ -29,23 +54,84 @@ def miller_rabin_test(n, k):
         d //= 2
         r += 1
     
-    def check_composite(a):
-        # a^d % n
-        x = pow(a, d, n)
-        if x == 1 or x == n - 1:
-            return False
-        for _ in range(r - 1):
-            x = pow(x, 2, n)
-            if x == n - 1:
-                return False
-        return True
-    
     for _ in range(k):
         a = random.randint(2, n - 2)
-        if check_composite(a):
+        if check_composite(n, a, d, r):
             return False
     return True
 
+# True if a proves n composite (n - 1 = d * 2^r)
+def check_composite(n, a, d, r):
+    # a^d % n
+    x = pow(a, d, n)
+    if x == 1 or x == n - 1:
+        return False
+    for _ in range(r - 1):
+        x = pow(x, 2, n)
+        if x == n - 1:
+            return False
+    return True
+
+# Trial division by the small primes: True or False when that settles it, else None
+def trial_division(n):
+    if n < 2:
+        return False
+    if n < TRIAL_DIVISION_LIMIT:
+        return n in SMALL_PRIME_SET
+    if gcd(n, SMALL_PRIMES_PRODUCT) != 1:
+        return False
+    if n < TRIAL_DIVISION_LIMIT * TRIAL_DIVISION_LIMIT:
+        return True  # no prime factor up to its square root
+    return None
+
+# Miller-Rabin with fixed bases: exact below 3.3e24, k extra random witnesses above that
+def miller_rabin_deterministic(n, k=20):
+    d, r = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        r += 1
+
+    for bound, bases in DETERMINISTIC_BASES:
+        if n < bound:
+            return not any(check_composite(n, a, d, r) for a in bases)
+    # Beyond the table: the largest base set plus random witnesses
+    bases = DETERMINISTIC_BASES[-1][1] + [random.randint(2, n - 2) for _ in range(k)]
+    return not any(check_composite(n, a, d, r) for a in bases)
+
+# Primality test: trial division first, then deterministic Miller-Rabin
+def is_prime(n, k=20):
+    result = trial_division(n)
+    if result is not None:
+        return result
+    return miller_rabin_deterministic(n, k)
+
+def prime_chunk(chunk):
+    """Helper function to test one chunk of candidates in a worker"""
+    numbers, k = chunk
+    if numbers and max(numbers) < 2 ** 64 and min(numbers) >= 0:
+        # Vectorized trial division: one NumPy remainder per small prime
+        values = np.array(numbers, dtype=np.uint64)
+        maybe = values >= 2
+        for p in SMALL_PRIMES:
+            maybe &= (values % np.uint64(p) != 0) | (values == p)
+        results = [False] * len(numbers)
+        for i in np.flatnonzero(maybe).tolist():
+            n = numbers[i]
+            results[i] = n < TRIAL_DIVISION_LIMIT ** 2 or miller_rabin_deterministic(n, k)
+        return results
+    return [is_prime(n, k) for n in numbers]
+
+# Test many candidates at once, sharded across a process pool
+def is_prime_batch(numbers, k=20, num_processes=None, chunk_size=65536):
+    numbers = [int(n) for n in numbers]
+    chunks = [(numbers[i:i + chunk_size], k) for i in range(0, len(numbers), chunk_size)]
+    if num_processes == 1 or len(chunks) <= 1:
+        results = [prime_chunk(chunk) for chunk in chunks]
+    else:
+        with Pool(processes=num_processes or cpu_count()) as pool:
+            results = pool.map(prime_chunk, chunks)
+    return [flag for chunk in results for flag in chunk]
+
 # Monte Carlo simulation for primality test using both methods
 def monte_carlo_primality_test(n, k):
     fermat_result = fermat_test(n, k)
@@ -62,12 +148,12 @@ def main():
     for n in n_values:
         # Measure time for Fermat's test
         start_time = time.time()
-        fermat_result, _ = monte_carlo_primality_test(n, k)
+        fermat_result = fermat_test(n, k)
         fermat_times.append(time.time() - start_time)
         
         # Measure time for Miller-Rabin test
         start_time = time.time()
-        _, miller_rabin_result = monte_carlo_primality_test(n, k)
+        miller_rabin_result = miller_rabin_test(n, k)
         miller_rabin_times.append(time.time() - start_time)
         
         print(f"Testing n = {n}:")
@@ -2,7 +2,12 @@ import matplotlib.pyplot as plt
 import numpy as np
 import time
 import random
+import tracemalloc
+from array import array
 from multiprocessing import Pool, cpu_count
+from kway_merge import merge_sorted_arrays, merge_runs, merge_sorted_indices
+from numpy.lib import recfunctions
+from shared_sort import shared_memory_sort
 
 # Sequential Merge Sort
 def sequential_mergesort(arr):
@@ -13,20 +18,138 @@ def sequential_mergesort(arr):
     right = sequential_mergesort(arr[mid:])
     return merge_sorted_arrays([left, right])
 
+# Runs shorter than this are extended with insertion sort before merging
+INSERTION_SORT_CUTOFF = 32
+
+def _insertion_sort(buf, lo, sorted_hi, hi):
+    """Insert buf[sorted_hi:hi] into the already sorted buf[lo:sorted_hi]"""
+    for i in range(sorted_hi, hi):
+        item = buf[i]
+        j = i - 1
+        while j >= lo and item < buf[j]:
+            buf[j + 1] = buf[j]
+            j -= 1
+        buf[j + 1] = item
+
+def _reverse(buf, lo, hi):
+    hi -= 1
+    while lo < hi:
+        buf[lo], buf[hi] = buf[hi], buf[lo]
+        lo += 1
+        hi -= 1
+
+def _merge_into(src, dst, lo, mid, hi):
+    """Stable merge of src[lo:mid] and src[mid:hi] into dst[lo:hi]"""
+    i, j, k = lo, mid, lo
+    while i < mid and j < hi:
+        if src[j] < src[i]:
+            dst[k] = src[j]
+            j += 1
+        else:
+            dst[k] = src[i]
+            i += 1
+        k += 1
+    while i < mid:
+        dst[k] = src[i]
+        i += 1
+        k += 1
+    while j < hi:
+        dst[k] = src[j]
+        j += 1
+        k += 1
+
+# Split buf into sorted runs: natural runs, padded to the cutoff with insertion sort
+def _find_runs(buf, cutoff):
+    n = len(buf)
+    bounds = [0]
+    lo = 0
+    while lo < n:
+        hi = lo + 1
+        if hi < n and buf[hi] < buf[lo]:
+            # Strictly descending runs are reversed, which keeps the sort stable
+            while hi < n and buf[hi] < buf[hi - 1]:
+                hi += 1
+            _reverse(buf, lo, hi)
+        else:
+            while hi < n and not buf[hi] < buf[hi - 1]:
+                hi += 1
+        if hi - lo < cutoff:
+            end = min(lo + cutoff, n)
+            _insertion_sort(buf, lo, hi, end)
+            hi = end
+        bounds.append(hi)
+        lo = hi
+    return bounds
+
+def _find_runs_numpy(buf, cutoff):
+    n = len(buf)
+    breaks = np.flatnonzero(buf[1:] < buf[:-1]) + 1
+    if len(breaks) <= n // cutoff:
+        return [0] + breaks.tolist() + [n]
+    # Mostly short runs: sort fixed blocks of cutoff elements in one call instead
+    full = n - n % cutoff
+    blocks = buf[:full].reshape(-1, cutoff)
+    blocks.sort(axis=1, kind='stable')
+    buf[:full] = blocks.reshape(-1)
+    buf[full:].sort(kind='stable')
+    return list(range(0, full, cutoff)) + ([full] if full < n else []) + [n]
+
+# Bottom-up merge sort on a mutable buffer with one ping-pong scratch buffer
+def bottom_up_mergesort(buf, cutoff=INSERTION_SORT_CUTOFF):
+    """Sort an array.array, NumPy array or list in place and return it.
+
+    No slices are copied per level: runs are merged back and forth between
+    buf and a single scratch buffer of the same size.
+    """
+    n = len(buf)
+    if n <= 1:
+        return buf
+
+    if isinstance(buf, np.ndarray):
+        # Same scheme with vectorized run detection and merges
+        merged = merge_runs(buf, _find_runs_numpy(buf, cutoff))
+        if merged is not buf:
+            buf[:] = merged
+        return buf
+
+    bounds = _find_runs(buf, cutoff)
+    if len(bounds) <= 2:
+        return buf
+
+    scratch = buf[:]
+    src, dst = buf, scratch
+    while len(bounds) > 2:
+        num_runs = len(bounds) - 1
+        merged_bounds = [0]
+        for i in range(0, num_runs, 2):
+            lo = bounds[i]
+            if i + 1 < num_runs:
+                mid, hi = bounds[i + 1], bounds[i + 2]
+                _merge_into(src, dst, lo, mid, hi)
+            else:
+                hi = bounds[i + 1]
+                dst[lo:hi] = src[lo:hi]
+            merged_bounds.append(hi)
+        bounds = merged_bounds
+        src, dst = dst, src
+
+    if src is not buf:
+        buf[:] = src
+    return buf
+
 # Parallel Merge Sort helper function
 def parallel_mergesort(arr):
     """Helper function to sort chunks of data in parallel"""
-    if len(arr) <= 1:
-        return arr
-    mid = len(arr) // 2
-    left = arr[:mid]
-    right = arr[mid:]
-    return merge_sorted_arrays([parallel_mergesort(left), parallel_mergesort(right)])
+    return bottom_up_mergesort(list(arr))
 
 # Parallel Merge Sort with multiprocessing
-def parallel_merge_sort(arr, num_processes=None):
+def parallel_merge_sort(arr, num_processes=None, use_shared_memory=False):
     if num_processes is None:
         num_processes = cpu_count()
+
+    # Zero-copy mode: workers sort slices of one shared NumPy buffer in place
+    if use_shared_memory:
+        return shared_memory_sort(arr, num_processes, kind='mergesort')
     
     # Split data into chunks for parallel processing
     chunk_size = len(arr) // num_processes
@@ -39,36 +162,70 @@ def parallel_merge_sort(arr, num_processes=None):
     # Merge sorted chunks
     return merge_sorted_arrays(sorted_chunks)
 
-# Merge sorted arrays into one
-def merge_sorted_arrays(arrays):
-    """Merge multiple sorted arrays into a single sorted array"""
-    result = []
-    indices = [0] * len(arrays)
-    
-    while True:
-        min_val = float('inf')
-        min_idx = -1
-        
-        # Find the smallest value among current positions
-        for i in range(len(arrays)):
-            if indices[i] < len(arrays[i]) and arrays[i][indices[i]] < min_val:
-                min_val = arrays[i][indices[i]]
-                min_idx = i
-        
-        if min_idx == -1:  # All arrays are exhausted
-            break
-            
-        result.append(min_val)
-        indices[min_idx] += 1
-    
-    return result
-
 # Measure sorting time for performance comparison
 def measure_sorting_time(sort_func, arr, **kwargs):
     start_time = time.time()
     sorted_arr = sort_func(arr.copy(), **kwargs)
     return time.time() - start_time
 
+def argsort_chunk(args):
+    """Helper function to argsort chunks of keys in parallel"""
+    keys, offset = args
+    return np.argsort(keys, kind='stable') + offset
+
+# Parallel stable argsort: argsort chunks in parallel, then merge the index runs
+def parallel_argsort(records, key=None, num_processes=None):
+    """Return the stable permutation that sorts records.
+
+    records is a key column or a NumPy structured array; key names the field
+    (or list of fields) to sort by. Gather any column with records[order].
+    """
+    if num_processes is None:
+        num_processes = cpu_count()
+
+    keys = np.asarray(records if key is None else records[key])
+    if keys.dtype.names is not None:
+        # Drop the other fields' padding so only the keys are pickled to workers
+        keys = recfunctions.repack_fields(keys)
+    n = len(keys)
+
+    chunk_size = max(1, -(-n // num_processes))
+    chunks = [(keys[i:i + chunk_size], i) for i in range(0, n, chunk_size)]
+
+    with Pool(processes=num_processes) as pool:
+        runs = pool.map(argsort_chunk, chunks)
+
+    return merge_sorted_indices(keys, runs)
+
+# Sort a structured array by key through parallel_argsort
+def parallel_record_sort(records, key, num_processes=None):
+    return records[parallel_argsort(records, key, num_processes)]
+
+# Compare time and peak memory of the recursive and bottom-up merge sorts
+def compare_mergesort_allocations(size=200000):
+    arr = random.sample(range(1, size * 10), size)
+    expected = sorted(arr)
+    candidates = [
+        ("Recursive merge sort (lists)", lambda: sequential_mergesort(arr)),
+        ("Bottom-up merge sort (array.array)", lambda: bottom_up_mergesort(array('q', arr))),
+        ("Bottom-up merge sort (NumPy)", lambda: bottom_up_mergesort(np.array(arr))),
+    ]
+
+    print(f"Allocation comparison for {size} elements")
+    for label, sort_call in candidates:
+        start_time = time.time()
+        result = sort_call()
+        elapsed = time.time() - start_time
+        assert list(result) == expected
+
+        # Second run under tracemalloc, which would otherwise skew the timing
+        tracemalloc.start()
+        sort_call()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        print(f"{label}: {elapsed:.4f}s, peak traced memory {peak / 2**20:.2f} MiB")
+
 # Plot complexity comparison
 def plot_complexity_comparison():
     # Test different input sizes
@@ -121,4 +278,5 @@ def plot_complexity_comparison():
     plt.show()
 
 if __name__ == "__main__":
+    compare_mergesort_allocations()
     plot_complexity_comparison()
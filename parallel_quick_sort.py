@@ -2,24 +2,125 @@ import matplotlib.pyplot as plt
 import numpy as np
 import time
 import random
+import bisect
 from multiprocessing import Pool, cpu_count
+from kway_merge import merge_sorted_arrays
+from shared_sort import shared_memory_sort
+
+# Ranges at or below this size are finished with insertion sort
+INSERTION_SORT_CUTOFF = 16
+
+def _insertion_sort(buf, lo, hi):
+    for i in range(lo + 1, hi):
+        item = buf[i]
+        j = i - 1
+        while j >= lo and item < buf[j]:
+            buf[j + 1] = buf[j]
+            j -= 1
+        buf[j + 1] = item
+
+def _sift_down(buf, lo, root, size):
+    item = buf[lo + root]
+    child = 2 * root + 1
+    while child < size:
+        if child + 1 < size and buf[lo + child] < buf[lo + child + 1]:
+            child += 1
+        if not item < buf[lo + child]:
+            break
+        buf[lo + root] = buf[lo + child]
+        root = child
+        child = 2 * root + 1
+    buf[lo + root] = item
+
+def _heapsort(buf, lo, hi):
+    size = hi - lo
+    for root in range(size // 2 - 1, -1, -1):
+        _sift_down(buf, lo, root, size)
+    for end in range(size - 1, 0, -1):
+        buf[lo], buf[lo + end] = buf[lo + end], buf[lo]
+        _sift_down(buf, lo, 0, end)
+
+def _median_of_three(buf, a, b, c):
+    x, y, z = buf[a], buf[b], buf[c]
+    if x < y:
+        if y < z:
+            return b
+        return c if x < z else a
+    if x < z:
+        return a
+    return c if y < z else b
+
+# Median-of-three for small ranges, Tukey's ninther for large ones
+def _choose_pivot(buf, lo, hi):
+    mid = (lo + hi) // 2
+    last = hi - 1
+    if hi - lo > 40:
+        step = (hi - lo) // 8
+        return buf[_median_of_three(
+            buf,
+            _median_of_three(buf, lo, lo + step, lo + 2 * step),
+            _median_of_three(buf, mid - step, mid, mid + step),
+            _median_of_three(buf, last - 2 * step, last - step, last),
+        )]
+    return buf[_median_of_three(buf, lo, mid, last)]
+
+# Dutch national flag partition: buf[lo:lt] < pivot == buf[lt:gt] < buf[gt:hi]
+def _partition3(buf, lo, hi, pivot):
+    lt, i, gt = lo, lo, hi
+    while i < gt:
+        item = buf[i]
+        if item < pivot:
+            buf[lt], buf[i] = item, buf[lt]
+            lt += 1
+            i += 1
+        elif pivot < item:
+            gt -= 1
+            buf[gt], buf[i] = item, buf[gt]
+        else:
+            i += 1
+    return lt, gt
+
+# In-place introsort on a mutable buffer (list, array.array or NumPy array)
+def introsort(buf, lo=0, hi=None):
+    if hi is None:
+        hi = len(buf)
+    # Quicksort gets 2*log2(n) levels before the range falls back to heapsort
+    depth_limit = 2 * max(1, hi - lo).bit_length()
+
+    # Explicit stack: the smaller side is looped on, so it stays O(log n) deep
+    stack = [(lo, hi, depth_limit)]
+    while stack:
+        lo, hi, depth = stack.pop()
+        while hi - lo > INSERTION_SORT_CUTOFF:
+            if depth == 0:
+                _heapsort(buf, lo, hi)
+                break
+            depth -= 1
+            lt, gt = _partition3(buf, lo, hi, _choose_pivot(buf, lo, hi))
+            if lt - lo < hi - gt:
+                stack.append((gt, hi, depth))
+                hi = lt
+            else:
+                stack.append((lo, lt, depth))
+                lo = gt
+        else:
+            _insertion_sort(buf, lo, hi)
+    return buf
 
 def sequential_quicksort(arr):
-    if len(arr) <= 1:
-        return arr
-    pivot = arr[len(arr) // 2]
-    left = [x for x in arr if x < pivot]
-    middle = [x for x in arr if x == pivot]
-    right = [x for x in arr if x > pivot]
-    return sequential_quicksort(left) + middle + sequential_quicksort(right)
+    return introsort(list(arr))
 
 def parallel_partition(data):
     """Helper function to sort chunks of data in parallel"""
-    return sequential_quicksort(data)
+    return introsort(data)
 
-def parallel_quicksort(arr, num_processes=None):
+def parallel_quicksort(arr, num_processes=None, use_shared_memory=False):
     if num_processes is None:
         num_processes = cpu_count()
+
+    # Zero-copy mode: workers sort slices of one shared NumPy buffer in place
+    if use_shared_memory:
+        return shared_memory_sort(arr, num_processes, kind='quicksort')
         
     # If array is small, use sequential sort
     if len(arr) < 100000:
@@ -36,28 +137,55 @@ def parallel_quicksort(arr, num_processes=None):
     # Merge sorted chunks
     return merge_sorted_arrays(sorted_chunks)
 
-def merge_sorted_arrays(arrays):
-    """Merge multiple sorted arrays into a single sorted array"""
+def sample_sort_bucketize(args):
+    """Helper function to sort a chunk and cut it into one piece per bucket"""
+    data, splitters = args
+    data = parallel_partition(data)
+    cuts = [0] + [bisect.bisect_right(data, s) for s in splitters] + [len(data)]
+    return [data[cuts[i]:cuts[i + 1]] for i in range(len(cuts) - 1)]
+
+def bucket_skew(bucket_sizes):
+    """Summarize how evenly the splitters divided the input"""
+    total = sum(bucket_sizes)
+    mean = total / len(bucket_sizes) if bucket_sizes else 0
+    largest = max(bucket_sizes, default=0)
+    return {
+        'bucket_sizes': list(bucket_sizes),
+        'min': min(bucket_sizes, default=0),
+        'max': largest,
+        'mean': mean,
+        # 1.0 is a perfect split; the slowest bucket bounds the parallel phase
+        'max_over_mean': largest / mean if mean else 0.0,
+    }
+
+# Parallel sample sort: p-1 splitters, so sorted buckets simply concatenate
+def parallel_sample_sort(arr, num_processes=None, oversampling=32, return_skew=False):
+    if num_processes is None:
+        num_processes = cpu_count()
+    n = len(arr)
+
+    # Choose p-1 splitters from an oversampled, sorted random sample
+    sample_size = min(n, num_processes * oversampling)
+    sample = sorted(arr[i] for i in random.sample(range(n), sample_size))
+    splitters = [sample[i * sample_size // num_processes] for i in range(1, num_processes)] if sample else []
+
+    chunk_size = max(1, -(-n // num_processes))
+    chunks = [arr[i:i + chunk_size] for i in range(0, n, chunk_size)]
+
+    with Pool(processes=num_processes) as pool:
+        # Each worker sorts its chunk and cuts it at the splitters
+        pieces = pool.map(sample_sort_bucketize, [(chunk, splitters) for chunk in chunks])
+
+        # Bucket b gathers piece b of every chunk; buckets are merged independently
+        buckets = [[chunk_pieces[b] for chunk_pieces in pieces] for b in range(len(splitters) + 1)]
+        sorted_buckets = pool.map(merge_sorted_arrays, buckets)
+
     result = []
-    # Create a list of indices to track current position in each array
-    indices = [0] * len(arrays)
-    
-    while True:
-        min_val = float('inf')
-        min_idx = -1
-        
-        # Find the smallest value among current positions
-        for i in range(len(arrays)):
-            if indices[i] < len(arrays[i]) and arrays[i][indices[i]] < min_val:
-                min_val = arrays[i][indices[i]]
-                min_idx = i
-        
-        if min_idx == -1:  # All arrays are exhausted
-            break
-            
-        result.append(min_val)
-        indices[min_idx] += 1
-    
+    for bucket in sorted_buckets:
+        result.extend(bucket)
+
+    if return_skew:
+        return result, bucket_skew([len(bucket) for bucket in sorted_buckets])
     return result
 
 def measure_sorting_time(sort_func, arr, **kwargs):
@@ -2,11 +2,13 @@ import matplotlib.pyplot as plt
 import numpy as np
 import time
 import random
+import itertools
 from multiprocessing import Pool, cpu_count
+from shared_sort import create_shared_array, attach_shared_array
 
-def sequential_prefix_sum(arr):
+def sequential_prefix_sum(arr, dtype=np.int64):
     """Sequential implementation of prefix sum."""
-    result = np.zeros(len(arr), dtype=int)
+    result = np.zeros(len(arr), dtype=dtype)
     result[0] = arr[0]
     for i in range(1, len(arr)):
         result[i] = result[i - 1] + arr[i]
@@ -36,6 +38,324 @@ def parallel_prefix_sum(arr, num_processes=None):
     result = np.concatenate(partial_sums)
     return result
 
+def check_accumulator(data, dtype):
+    """Raise instead of silently wrapping if an integer prefix sum would overflow."""
+    dtype = np.dtype(dtype)
+    if dtype.kind not in 'iu' or len(data) == 0:
+        return
+    info = np.iinfo(dtype)
+    # Cheapest test: n times the largest magnitude still fits
+    largest = max(int(data.max()), -int(data.min()))
+    if largest * len(data) <= info.max:
+        return
+    # Every prefix sum lies between the negative and the positive totals
+    positive = data[data > 0].sum(dtype=np.float64)
+    negative = data[data < 0].sum(dtype=np.float64)
+    if positive < info.max / 2 and negative > info.min / 2:
+        return
+    # Otherwise check the actual running extremes with a float64 scan and its error bound
+    running = np.cumsum(data, dtype=np.float64)
+    slack = len(data) * np.finfo(np.float64).eps * (positive - negative)
+    if running.max() + slack < info.max and running.min() - slack > info.min:
+        return
+    # Too close to call in floating point: scan exactly in Python ints
+    exact = np.cumsum(data.astype(object))
+    if max(exact) > info.max or min(exact) < info.min:
+        raise OverflowError(f"prefix sums overflow {dtype}; use a wider accumulator "
+                            "such as float64 or object")
+
+def as_accumulator(arr, dtype=None):
+    """arr as a NumPy array in the accumulator dtype, plus that dtype.
+
+    dtype=None picks one from the input: float64 for floats, object for
+    Python ints too wide for NumPy, int64 (uint64 for unsigned) otherwise.
+    Non-integral floats are rejected rather than truncated into an integer
+    accumulator.
+    """
+    values = np.asarray(arr)
+    if dtype is None:
+        kind = values.dtype.kind
+        if kind in 'fc':
+            dtype = np.result_type(values.dtype, np.float64)
+        elif kind == 'O':
+            dtype = np.dtype(object)
+        else:
+            dtype = np.uint64 if kind == 'u' else np.int64
+    dtype = np.dtype(dtype)
+    if dtype.kind in 'iu' and values.dtype.kind in 'fc':
+        if not (np.isfinite(values).all() and (values == np.round(values.real)).all()):
+            raise ValueError(f"non-integral input would be truncated by a {dtype} accumulator")
+    return np.asarray(values, dtype=dtype), dtype
+
+def numpy_prefix_sum(arr, dtype=None):
+    """Single-process prefix sum with np.cumsum in the chosen accumulator dtype."""
+    data, dtype = as_accumulator(arr, dtype)
+    check_accumulator(data, dtype)
+    return np.cumsum(data, dtype=dtype)
+
+def scan_block(task):
+    """Pass 1 worker: scan one block of the shared buffer in place, return its total."""
+    name, shape, dtype, start, stop = task
+    shm, buf = attach_shared_array(name, shape, dtype)
+    block = buf[start:stop]
+    np.cumsum(block, out=block)
+    total = block[-1].item()
+    del block, buf
+    shm.close()
+    return total
+
+def add_block_offset(task):
+    """Pass 2 worker: add the exclusive scan of the preceding block totals."""
+    name, shape, dtype, start, stop, offset = task
+    shm, buf = attach_shared_array(name, shape, dtype)
+    buf[start:stop] += offset
+    del buf
+    shm.close()
+    return start
+
+def blocked_parallel_prefix_sum(arr, num_processes=None, dtype=None):
+    """Two-pass blocked parallel scan on a shared memory buffer."""
+    if num_processes is None:
+        num_processes = cpu_count()
+    data, dtype = as_accumulator(arr, dtype)
+
+    # Python objects cannot live in shared memory: use the exact single-process scan
+    if dtype.kind == 'O':
+        return np.cumsum(data, dtype=dtype)
+
+    check_accumulator(data, dtype)
+    n = len(data)
+    if n < 100000:
+        return np.cumsum(data, dtype=dtype)
+
+    shm, buf = create_shared_array((n,), dtype)
+    try:
+        buf[:] = data
+        del data
+
+        block_size = -(-n // num_processes)
+        blocks = [(i, min(i + block_size, n)) for i in range(0, n, block_size)]
+        with Pool(processes=num_processes) as pool:
+            # Pass 1: local scans give each block's total
+            totals = pool.map(scan_block, [(shm.name, (n,), dtype.str, lo, hi) for lo, hi in blocks])
+
+            # Exclusive scan of the block totals, then a parallel offset add
+            offsets = np.cumsum(np.array(totals[:-1], dtype=dtype), dtype=dtype)
+            pool.map(add_block_offset, [(shm.name, (n,), dtype.str, lo, hi, offset)
+                                        for (lo, hi), offset in zip(blocks[1:], offsets)])
+
+        result = buf.copy()
+    finally:
+        buf = None
+        shm.close()
+        shm.unlink()
+    return result
+
+# Scan engine: pick a backend and an accumulator dtype
+def prefix_sum(arr, backend='numpy', dtype=None, num_processes=None):
+    """Prefix sum of arr.
+
+    backend is 'numpy' (single-process np.cumsum), 'parallel' (blocked scan on
+    shared memory) or 'python' (the sequential loop). dtype is the accumulator:
+    int64, float64, or object for exact big-int sums; None picks one from the
+    input (see as_accumulator). Integer accumulators raise OverflowError
+    rather than wrap, on every backend.
+    """
+    if backend == 'numpy':
+        return numpy_prefix_sum(arr, dtype)
+    if backend == 'parallel':
+        return blocked_parallel_prefix_sum(arr, num_processes, dtype)
+    if backend == 'python':
+        data, dtype = as_accumulator(arr, dtype)
+        check_accumulator(data, dtype)
+        if len(data) == 0:
+            return np.zeros(0, dtype=dtype)
+        return sequential_prefix_sum(data, dtype)
+    raise ValueError(f"unknown prefix sum backend: {backend!r}")
+
+def segmented_accumulate(op, chunk, flags):
+    """Inclusive ufunc scan of chunk that restarts wherever flags is set."""
+    starts = np.flatnonzero(flags)
+    if len(starts) < len(chunk) // 64:
+        # Few segments: one native accumulate per segment
+        out = np.empty_like(chunk)
+        bounds = [0] + starts.tolist() + [len(chunk)]
+        for lo, hi in zip(bounds[:-1], bounds[1:]):
+            if hi > lo:
+                op.accumulate(chunk[lo:hi], out=out[lo:hi])
+        return out
+
+    # Many short segments: log2(n) vectorized doubling steps (Hillis-Steele)
+    out = chunk.copy()
+    started = np.asarray(flags, dtype=bool).copy()
+    step = 1
+    while step < len(out):
+        combined = op(out[:-step], out[step:])
+        out[step:] = np.where(started[step:], out[step:], combined)
+        started[step:] |= started[:-step]
+        step *= 2
+    return out
+
+def scan_chunk(task):
+    """Inclusive scan of one chunk with a ufunc or a Python binary operator."""
+    chunk, op, flags = task
+    if isinstance(op, np.ufunc):
+        if flags is None:
+            return op.accumulate(chunk)
+        return segmented_accumulate(op, chunk, flags)
+
+    # Slow path for plain Python operators
+    result = []
+    for i, item in enumerate(chunk):
+        if i == 0 or (flags is not None and flags[i]):
+            acc = item
+        else:
+            acc = op(acc, item)
+        result.append(acc)
+    return result
+
+def scan(arr, op=np.add, flags=None, num_processes=None, dtype=None):
+    """Parallel inclusive scan with any associative operator.
+
+    op is a NumPy ufunc (np.add, np.maximum, np.minimum, np.multiply, ...)
+    or, as a slow path, a picklable Python binary function. If flags is
+    given, a new segment starts wherever it is true and the scan restarts
+    there. Returns an ndarray for ufuncs and a list for Python operators.
+    """
+    if num_processes is None:
+        num_processes = cpu_count()
+
+    if isinstance(op, np.ufunc):
+        data = np.asarray(arr, dtype=dtype)
+    else:
+        data = list(arr)
+    if flags is not None:
+        flags = np.asarray(flags, dtype=bool)
+    n = len(data)
+
+    # If array is small, scan it in one piece
+    if n < 100000 or num_processes == 1:
+        return scan_chunk((data, op, flags))
+
+    # Same chunk layout as parallel_prefix_sum
+    chunk_size = -(-n // num_processes)
+    starts = range(0, n, chunk_size)
+    tasks = [(data[i:i + chunk_size], op, None if flags is None else flags[i:i + chunk_size])
+             for i in starts]
+
+    with Pool(processes=num_processes) as pool:
+        partial_scans = pool.map(scan_chunk, tasks)
+
+    # Carry each chunk's last value into the next chunk, up to its first segment start
+    for i in range(1, len(partial_scans)):
+        carry = partial_scans[i - 1][-1]
+        part = partial_scans[i]
+        end = len(part)
+        if flags is not None:
+            chunk_starts = np.flatnonzero(tasks[i][2])
+            if len(chunk_starts):
+                end = chunk_starts[0]
+        if isinstance(op, np.ufunc):
+            part[:end] = op(carry, part[:end])
+        else:
+            part[:end] = [op(carry, item) for item in part[:end]]
+
+    if isinstance(op, np.ufunc):
+        return np.concatenate(partial_scans)
+    return [item for part in partial_scans for item in part]
+
+def iter_prefix_sum_blocks(source, block_size=1 << 20, dtype=np.int64):
+    """Stream prefix sums of source one block at a time.
+
+    source is an iterable of numbers, a NumPy array / np.memmap, or the path
+    of a raw binary file of dtype values (read through np.memmap). Only one
+    block is in memory at a time; the running total is carried across blocks.
+    """
+    dtype = np.dtype(dtype)
+    if isinstance(source, str):
+        source = np.memmap(source, dtype=dtype, mode='r')
+
+    carry = dtype.type(0)
+    if isinstance(source, np.ndarray):
+        blocks = (source[i:i + block_size] for i in range(0, len(source), block_size))
+    else:
+        iterator = iter(source)
+        blocks = (np.fromiter(itertools.islice(iterator, block_size), dtype=dtype)
+                  for _ in itertools.count())
+
+    for block in blocks:
+        if len(block) == 0:
+            break
+        sums = np.cumsum(block, dtype=dtype)
+        sums += carry
+        carry = sums[-1]
+        yield sums
+
+def stream_prefix_sum(source, output_path, block_size=1 << 20, dtype=np.int64):
+    """Write the prefix sums of source to a raw binary file; return the grand total."""
+    dtype = np.dtype(dtype)
+    total = dtype.type(0)
+    with open(output_path, 'wb') as out:
+        for sums in iter_prefix_sum_blocks(source, block_size, dtype):
+            sums.tofile(out)
+            total = sums[-1]
+    return total
+
+class FenwickTree:
+    """Range-sum index over an array: sums and point updates in O(log n)."""
+
+    def __init__(self, data, dtype=np.int64):
+        values = np.asarray(data, dtype=dtype)
+        self.n = len(values)
+        # Built from one prefix sum pass: node i covers (i - lowbit(i), i]
+        prefix = np.zeros(self.n + 1, dtype=dtype)
+        np.cumsum(values, out=prefix[1:])
+        nodes = np.arange(1, self.n + 1)
+        self.tree = np.zeros(self.n + 1, dtype=dtype)
+        self.tree[1:] = prefix[nodes] - prefix[nodes - (nodes & -nodes)]
+
+    def __len__(self):
+        return self.n
+
+    def _index(self, i):
+        # Negative indices count from the end, as for Python sequences
+        if i < 0:
+            i += self.n
+        if not 0 <= i < self.n:
+            raise IndexError("FenwickTree index out of range")
+        return i
+
+    def add(self, i, delta):
+        """Add delta to element i."""
+        i = self._index(i) + 1
+        while i <= self.n:
+            self.tree[i] += delta
+            i += i & -i
+
+    def prefix_sum(self, i):
+        """Sum of the first i elements."""
+        if not 0 <= i <= self.n:
+            raise IndexError("FenwickTree prefix length out of range")
+        total = self.tree.dtype.type(0)
+        while i > 0:
+            total += self.tree[i]
+            i -= i & -i
+        return total
+
+    def sum(self, i, j):
+        """Sum of elements i..j-1, like sum(data[i:j])."""
+        if not 0 <= i <= j <= self.n:
+            raise IndexError("FenwickTree range out of bounds")
+        return self.prefix_sum(j) - self.prefix_sum(i)
+
+    def __getitem__(self, i):
+        i = self._index(i)
+        return self.sum(i, i + 1)
+
+    def __setitem__(self, i, value):
+        i = self._index(i)
+        self.add(i, value - self[i])
+
 def measure_prefix_sum_time(prefix_sum_func, arr, **kwargs):
     start_time = time.time()
     result = prefix_sum_func(arr.copy(), **kwargs)
@@ -0,0 +1,95 @@
+import random
+import time
+from multiprocessing import Pool, cpu_count
+from monte_carlo import miller_rabin_test
+from segmented_sieve import base_primes
+
+# Odd candidates per window, and the primes each window is sieved against
+WINDOW_SIZE = 4096
+WINDOW_SIEVE_LIMIT = 1 << 16
+SIEVE_PRIMES = base_primes(WINDOW_SIEVE_LIMIT)[1:].tolist()  # odd primes only
+
+# Cross off start + 2i for every i that is a multiple of a small prime
+def sieve_window(start, size):
+    composite = bytearray(size)
+    for p in SIEVE_PRIMES:
+        # start + 2i = 0 (mod p)  <=>  i = -start * 2^-1 (mod p)
+        first = -start * ((p + 1) // 2) % p
+        if start + 2 * first == p:
+            first += p  # p itself is prime
+        composite[first::p] = b"\1" * len(range(first, size, p))
+    return composite
+
+def search_window(task):
+    """Helper function to find the first probable prime in one candidate window"""
+    start, size, bits, k = task
+    size = min(size, ((1 << bits) - start + 1) // 2)  # stay inside the bit size
+    composite = sieve_window(start, size)
+    stats = {'candidates': 0, 'sieved_out': 0, 'mr_rejected': 0}
+    for i in range(size):
+        stats['candidates'] += 1
+        if composite[i]:
+            stats['sieved_out'] += 1
+            continue
+        n = start + 2 * i
+        if miller_rabin_test(n, k):
+            return n, stats
+        stats['mr_rejected'] += 1
+    return None, stats
+
+# Random odd starting point with exactly the requested number of bits
+def random_window_start(bits, rng):
+    return rng.getrandbits(bits - 1) | (1 << (bits - 1)) | 1
+
+# generate count distinct probable primes of the given bit size
+def generate_primes(bits, count, k=20, num_processes=None, window_size=WINDOW_SIZE, seed=None):
+    """Return (primes, stats).
+
+    Each task sieves a window of odd candidates from a random start against
+    the odd primes below WINDOW_SIEVE_LIMIT, then runs Miller-Rabin (k
+    rounds) on survivors until the first probable prime. At most two
+    windows per process are outstanding, and the pool stops as soon as
+    count primes are in. stats counts candidates per stage and throughput.
+    """
+    if bits < 16:
+        raise ValueError("bits must be at least 16; use segmented_sieve for small primes")
+    if num_processes is None:
+        num_processes = cpu_count()
+    rng = random.Random(seed)
+
+    primes = []
+    stats = {'windows': 0, 'candidates': 0, 'sieved_out': 0, 'mr_rejected': 0}
+    start_time = time.time()
+
+    def next_task():
+        return (random_window_start(bits, rng), window_size, bits, k)
+
+    with Pool(processes=num_processes) as pool:
+        pending = [pool.apply_async(search_window, (next_task(),)) for _ in range(2 * num_processes)]
+        while len(primes) < count:
+            prime, window_stats = pending.pop(0).get()
+            stats['windows'] += 1
+            for stage, value in window_stats.items():
+                stats[stage] += value
+            if prime is not None and prime not in primes:
+                primes.append(prime)
+            if len(primes) < count:
+                pending.append(pool.apply_async(search_window, (next_task(),)))
+        # Leaving the block terminates the windows still in flight
+
+    elapsed = time.time() - start_time
+    stats['primes'] = len(primes)
+    stats['seconds'] = elapsed
+    stats['primes_per_second'] = len(primes) / elapsed if elapsed else float('inf')
+    return primes, stats
+
+if __name__ == "__main__":
+    bits = int(input("Enter the bit size of the primes: "))
+    count = int(input("Enter the number of primes to generate: "))
+
+    primes, stats = generate_primes(bits, count)
+    for p in primes:
+        print(hex(p))
+    print(f"{stats['primes']} primes in {stats['seconds']:.2f}s ({stats['primes_per_second']:.2f} primes/s)")
+    print(f"{stats['windows']} windows, {stats['candidates']} candidates: "
+          f"{stats['sieved_out']} sieved out, {stats['mr_rejected']} rejected by Miller-Rabin")
@@ -0,0 +1,159 @@
+import random
+import time
+from math import isqrt
+import numpy as np
+from multiprocessing import Pool, cpu_count
+from monte_carlo import fermat_test, miller_rabin_test
+
+# Odd numbers per segment: one byte each, so a segment is 256 KiB and stays in cache
+SEGMENT_SIZE = 1 << 18
+# Primes below this cross off with a strided slice; larger ones hit a segment rarely
+# enough that all of their hits are computed as one vectorized index array
+SLICE_PRIME_LIMIT = 64
+
+# Worker state, set once per process by init_worker
+_primes = None
+
+def init_worker(primes):
+    global _primes
+    _primes = primes
+
+# All primes up to limit (inclusive) with a plain odd-only sieve
+def base_primes(limit):
+    if limit < 2:
+        return np.zeros(0, dtype=np.int64)
+    is_odd_prime = np.ones((limit - 1) // 2 + 1, dtype=bool)  # index i stands for 2i + 1
+    is_odd_prime[0] = False
+    for i in range(1, (int(limit ** 0.5) - 1) // 2 + 1):
+        if is_odd_prime[i]:
+            p = 2 * i + 1
+            is_odd_prime[p * p // 2::p] = False
+    return np.concatenate([[2], 2 * np.flatnonzero(is_odd_prime) + 1]).astype(np.int64)
+
+# Odd primes in [lo, hi) where lo is odd; primes must hold every odd prime up to sqrt(hi)
+def sieve_segment(lo, hi, primes):
+    size = (hi - lo + 1) // 2  # index i stands for lo + 2i
+    is_prime = np.ones(size, dtype=bool)
+    if lo == 1:
+        is_prime[0] = False
+
+    primes = primes[(primes > 2) & (primes * primes < hi)]
+    # First odd multiple of each prime inside the segment, never below p^2
+    starts = np.maximum(primes * primes, (lo + primes - 1) // primes * primes)
+    starts += np.where(starts % 2 == 0, primes, 0)
+    first = (starts - lo) // 2
+
+    small = primes < SLICE_PRIME_LIMIT
+    for p, i in zip(primes[small].tolist(), first[small].tolist()):
+        is_prime[i::p] = False
+
+    # The rest: expand every (first hit, step) pair into its hit indices at once
+    steps, first = primes[~small], first[~small]
+    counts = np.maximum(0, (size - first + steps - 1) // steps)
+    total = int(counts.sum())
+    if total:
+        offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        is_prime[np.repeat(first, counts) + offsets * np.repeat(steps, counts)] = False
+
+    return lo + 2 * np.flatnonzero(is_prime).astype(np.int64)
+
+def sieve_task(bounds):
+    """Helper function to sieve one segment in a worker"""
+    lo, hi = bounds
+    return sieve_segment(lo, hi, _primes)
+
+def count_task(bounds):
+    """Helper function to count the primes of one segment in a worker"""
+    lo, hi = bounds
+    return len(sieve_segment(lo, hi, _primes))
+
+# Split [lo, hi) into odd-aligned segments of segment_size odd numbers
+def _segments(lo, hi, segment_size):
+    start = lo | 1
+    return [(s, min(s + 2 * segment_size, hi)) for s in range(start, hi, 2 * segment_size)]
+
+def _run(lo, hi, task, ordered, num_processes, segment_size):
+    lo = max(lo, 0)
+    primes = base_primes(int(max(hi - 1, 0) ** 0.5) + 1)
+    segments = _segments(lo, hi, segment_size)
+    if num_processes == 1 or len(segments) <= 1:
+        init_worker(primes)
+        yield from map(task, segments)
+        return
+    with Pool(processes=num_processes or cpu_count(), initializer=init_worker,
+              initargs=(primes,)) as pool:
+        results = pool.imap if ordered else pool.imap_unordered
+        yield from results(task, segments)
+
+# Stream the primes in [lo, hi) as one sorted NumPy array per segment
+def iter_prime_segments(lo, hi, num_processes=None, segment_size=SEGMENT_SIZE):
+    if lo <= 2 < hi:
+        yield np.array([2], dtype=np.int64)
+    yield from _run(lo, hi, sieve_task, True, num_processes, segment_size)
+
+# Stream the primes in [lo, hi) in increasing order
+def iter_primes(lo, hi, num_processes=None, segment_size=SEGMENT_SIZE):
+    for segment in iter_prime_segments(lo, hi, num_processes, segment_size):
+        yield from segment.tolist()
+
+# Number of primes in [lo, hi), without keeping them
+def count_primes(lo, hi, num_processes=None, segment_size=SEGMENT_SIZE):
+    count = int(lo <= 2 < hi)
+    return count + sum(_run(lo, hi, count_task, False, num_processes, segment_size))
+
+# Segments that cross_validate sieves in full to draw its prime samples from
+CROSS_VALIDATE_SEGMENTS = 4
+
+# Compare the sieve with fermat_test and miller_rabin_test on a sample of [lo, hi)
+def cross_validate(lo, hi, samples=1000, k=20):
+    """Return the sampled numbers on which each probabilistic test disagrees with the sieve.
+
+    Each random candidate is checked against the base primes alone; prime
+    samples come from a few random segments, so memory stays at one segment
+    plus the base primes. Fermat disagreements on Carmichael numbers are
+    expected; Miller-Rabin should report none.
+    """
+    lo = max(lo, 0)
+    primes = base_primes(int(max(hi - 1, 0) ** 0.5) + 1)
+
+    # A lone candidate: cross off with the base primes up to its square root
+    def is_prime(n):
+        divisors = primes[:np.searchsorted(primes, isqrt(n), side='right')]
+        return n >= 2 and not np.any(n % divisors == 0)
+
+    candidates = random.sample(range(max(lo, 4), hi), min(samples, max(hi - max(lo, 4), 0)))
+    expected = {n: is_prime(n) for n in candidates}
+
+    # Prime samples: every prime of a few randomly chosen segments
+    start = lo | 1
+    num_segments = max(0, -(-(hi - start) // (2 * SEGMENT_SIZE)))
+    found = [2] if lo <= 2 < hi else []
+    for s in random.sample(range(num_segments), min(CROSS_VALIDATE_SEGMENTS, num_segments)):
+        seg_lo = start + 2 * SEGMENT_SIZE * s
+        found += sieve_segment(seg_lo, min(seg_lo + 2 * SEGMENT_SIZE, hi), primes).tolist()
+    for n in random.sample(found, min(samples, len(found))):
+        candidates.append(n)
+        expected[n] = True
+
+    mismatches = {'fermat': [], 'miller_rabin': []}
+    for n in candidates:
+        if fermat_test(n, k) != expected[n]:
+            mismatches['fermat'].append(n)
+        if miller_rabin_test(n, k) != expected[n]:
+            mismatches['miller_rabin'].append(n)
+    mismatches['checked'] = len(candidates)
+    return mismatches
+
+if __name__ == "__main__":
+    lo = int(input("Enter the start of the range: "))
+    hi = int(input("Enter the end of the range (exclusive): "))
+
+    start_time = time.time()
+    count = count_primes(lo, hi)
+    print(f"{count} primes in [{lo}, {hi}) ({time.time() - start_time:.2f}s)")
+
+    if hi - lo <= 1000:
+        print(list(iter_primes(lo, hi)))
+    report = cross_validate(lo, hi, samples=200)
+    print(f"Cross-validation on {report['checked']} numbers: "
+          f"Fermat mismatches {report['fermat']}, Miller-Rabin mismatches {report['miller_rabin']}")
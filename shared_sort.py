@@ -0,0 +1,70 @@
+import numpy as np
+from multiprocessing import Pool, cpu_count, shared_memory
+from kway_merge import merge_runs
+
+# Allocate a NumPy array backed by a new shared memory block
+def create_shared_array(shape, dtype):
+    dtype = np.dtype(dtype)
+    size = max(int(np.prod(shape)) * dtype.itemsize, 1)
+    shm = shared_memory.SharedMemory(create=True, size=size)
+    return shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+# Map an existing shared memory block as a NumPy array (used inside workers)
+def attach_shared_array(name, shape, dtype):
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+
+def _sort_shared_slice(task):
+    """Worker: sort one slice of the shared buffer in place and return its bounds"""
+    name, shape, dtype, start, stop, kind = task
+    shm, buf = attach_shared_array(name, shape, dtype)
+    buf[start:stop].sort(kind=kind)
+    del buf  # the view must go before the mapping can be closed
+    shm.close()
+    return start, stop
+
+# Sort through a shared memory buffer: only slice offsets cross process boundaries
+def shared_memory_sort(arr, num_processes=None, kind='quicksort'):
+    """Sort arr with the chunks sorted in place by workers in shared memory.
+
+    Peak memory is the shared buffer plus one scratch buffer of the same
+    size for the merge. Returns an ndarray for ndarray input, else a list.
+    """
+    if num_processes is None:
+        num_processes = cpu_count()
+
+    data = np.asarray(arr)
+    if data.dtype.kind not in 'iuf' or data.ndim != 1:
+        raise TypeError("shared memory sort needs a flat array of ints or floats")
+    n = len(data)
+    if n == 0:
+        return data.copy() if isinstance(arr, np.ndarray) else []
+
+    shm, buf = create_shared_array(data.shape, data.dtype)
+    try:
+        buf[:] = data
+        del data
+
+        # Split the buffer into one slice per process
+        chunk_size = max(1, -(-n // num_processes))
+        tasks = [(shm.name, buf.shape, buf.dtype.str, i, min(i + chunk_size, n), kind)
+                 for i in range(0, n, chunk_size)]
+
+        with Pool(processes=num_processes) as pool:
+            bounds = pool.map(_sort_shared_slice, tasks)
+
+        # Merge the sorted slices between the shared buffer and one scratch buffer
+        scratch = np.empty_like(buf)
+        merged = merge_runs(buf, [bounds[0][0]] + [stop for _, stop in bounds], scratch)
+        if merged is buf:
+            scratch = None
+            result = buf.copy()
+        else:
+            result = merged
+    finally:
+        # Drop every view of the block before closing it
+        buf = merged = None
+        shm.close()
+        shm.unlink()
+
+    return result if isinstance(arr, np.ndarray) else result.tolist()
@@ -1,5 +1,7 @@
 import itertools
+import math
 import random
+import numpy as np
 
 # calculate the total distance of a given path
 def total_distance(graph, path):
@@ -29,6 +31,90 @@ def brute_force_tsp(graph):
             
     return best_distance, best_path
 
+# choose the smallest table dtype that can hold any tour length, plus its "infinity"
+def held_karp_dtype(graph):
+    dist = np.asarray(graph)
+    if dist.dtype.kind == 'f':
+        return np.dtype(np.float64), np.inf
+    longest = int(dist.max()) * len(graph) if dist.size else 0
+    for dtype in (np.int32, np.int64):
+        unreachable = np.iinfo(dtype).max // 2
+        if longest < unreachable:
+            return np.dtype(dtype), unreachable
+    raise OverflowError("distances are too large for an int64 DP table")
+
+# estimate the bytes Held-Karp allocates for n cities
+def held_karp_memory(n, itemsize=4):
+    if n <= 2:
+        return 0
+    m = n - 1
+    states = 1 << m
+    tables = states * m * (itemsize + 1)  # cost table + int8 predecessor table
+    masks = states * (1 + 8)  # popcounts + one layer of mask indices
+    # candidate matrix for the largest layer: costs plus argmin indices
+    largest_layer = math.comb(m - 1, (m - 1) // 2)
+    scratch = largest_layer * m * (itemsize + 8)
+    return tables + masks + scratch
+
+# solve TSP exactly with the Held-Karp bitmask DP in O(n^2 * 2^n)
+def held_karp_tsp(graph, memory_limit=None, verbose=False):
+    n = len(graph)
+    if n <= 2:
+        return total_distance(graph, list(range(n))) if n else 0, tuple(range(n))
+    if n - 1 > 127:
+        raise ValueError("Held-Karp supports at most 128 cities")
+
+    dtype, unreachable = held_karp_dtype(graph)
+    needed = held_karp_memory(n, dtype.itemsize)
+    if verbose:
+        print(f"Held-Karp for {n} cities needs about {needed / 2**20:.1f} MiB")
+    if memory_limit is not None and needed > memory_limit:
+        raise MemoryError(f"Held-Karp for {n} cities needs about {needed / 2**20:.1f} MiB, "
+                          f"over the {memory_limit / 2**20:.1f} MiB limit")
+
+    dist = np.asarray(graph, dtype=dtype)
+    m = n - 1  # city 0 is the fixed start; bit j stands for city j + 1
+    inner = dist[1:, 1:]
+    states = 1 << m
+
+    # cost[mask, j]: shortest path from 0 through exactly mask, ending at city j + 1
+    cost = np.full((states, m), unreachable, dtype=dtype)
+    parent = np.full((states, m), -1, dtype=np.int8)
+    singles = 1 << np.arange(m)
+    cost[singles, np.arange(m)] = dist[0, 1:]
+
+    all_masks = np.arange(states)
+    popcount = np.zeros(states, dtype=np.uint8)
+    for j in range(m):
+        popcount += ((all_masks >> j) & 1).astype(np.uint8)
+    del all_masks
+
+    # fill the table one subset size at a time, one end city per vectorized step
+    for size in range(2, m + 1):
+        layer = np.flatnonzero(popcount == size)
+        for j in range(m):
+            masks = layer[(layer >> j) & 1 == 1]
+            candidates = cost[masks ^ (1 << j)] + inner[:, j]
+            best = candidates.argmin(axis=1)
+            cost[masks, j] = candidates[np.arange(len(masks)), best]
+            parent[masks, j] = best
+
+    # close the tour back to city 0
+    full = states - 1
+    closing = cost[full] + dist[1:, 0]
+    last = int(closing.argmin())
+    best_distance = closing[last].item()
+
+    # walk the predecessor table back to the start
+    path = []
+    mask, j = full, last
+    while j != -1:
+        path.append(j + 1)
+        mask, j = mask ^ (1 << j), int(parent[mask, j])
+    path.append(0)
+
+    return best_distance, tuple(reversed(path))
+
 if __name__ == "__main__":
     n = int(input("Enter the number of cities: "))
     
@@ -40,7 +126,13 @@ if __name__ == "__main__":
     for row in graph:
         print(row)
     
-    best_distance, best_path = brute_force_tsp(graph)
-    
-    print(f"Shortest distance: {best_distance}")
-    print(f"Best path (city order): {best_path}")
+    # brute force is only practical for small instances
+    if n <= 10:
+        best_distance, best_path = brute_force_tsp(graph)
+        
+        print(f"Shortest distance: {best_distance}")
+        print(f"Best path (city order): {best_path}")
+
+    best_distance, best_path = held_karp_tsp(graph, verbose=True)
+    print(f"Held-Karp shortest distance: {best_distance}")
+    print(f"Held-Karp path (city order): {best_path}")
@@ -0,0 +1,147 @@
+import random
+import time
+import numpy as np
+from multiprocessing import Pool, Value, cpu_count
+from travelling_salesman import total_distance
+
+# Worker state, set once per process by init_worker
+_dist = None
+_incumbent = None
+_deadline = None
+
+def init_worker(dist, incumbent, deadline):
+    global _dist, _incumbent, _deadline
+    _dist, _incumbent, _deadline = dist, incumbent, deadline
+
+# Lower bound on any completion of a partial tour: reduced-matrix (row + column) reduction
+def reduced_matrix_bound(dist, path, cost, unvisited):
+    if not unvisited:
+        return cost + dist[path[-1], path[0]]
+    # The rest of the tour assigns each of these rows exactly one of these columns
+    rows = [path[-1]] + unvisited
+    cols = unvisited + [path[0]]
+    sub = dist[np.ix_(rows, cols)]  # the diagonal is inf, so u -> u never counts
+    sub[0, -1] = np.inf  # cannot close the tour while cities remain
+    row_min = sub.min(axis=1)
+    col_min = (sub - row_min[:, None]).min(axis=0)
+    return cost + row_min.sum() + col_min.sum()
+
+# Children of a node, each with its cost and lower bound
+def expand(dist, path, cost):
+    visited = set(path)
+    unvisited = [c for c in range(len(dist)) if c not in visited]
+    children = []
+    for city in unvisited:
+        child = path + (city,)
+        child_cost = cost + dist[path[-1], city]
+        rest = [c for c in unvisited if c != city]
+        children.append((reduced_matrix_bound(dist, child, child_cost, rest), child, child_cost))
+    return children
+
+# Offer a complete tour as the shared incumbent; True if it was the best so far
+def offer_incumbent(incumbent, length):
+    with incumbent.get_lock():
+        if length < incumbent.value:
+            incumbent.value = length
+            return True
+    return False
+
+def search_subtree(task):
+    """Helper function to search one subtree depth-first in a worker"""
+    bound, path, cost = task
+    dist, incumbent, deadline = _dist, _incumbent, _deadline
+    n = len(dist)
+    best_length, best_path = np.inf, None
+    stack = [(bound, path, cost)]
+    nodes = 0
+
+    while stack:
+        # Out of time: report the weakest bound still on the stack
+        nodes += 1
+        if deadline is not None and nodes % 256 == 1 and time.time() > deadline:
+            return best_length, best_path, min(b for b, _, _ in stack), nodes
+
+        bound, path, cost = stack.pop()
+        if bound >= incumbent.value:
+            continue
+        if len(path) == n:
+            length = cost + dist[path[-1], path[0]]
+            if offer_incumbent(incumbent, length):
+                best_length, best_path = length, path
+            continue
+
+        # Push the most promising child last so it is explored first
+        children = [child for child in expand(dist, path, cost) if child[0] < incumbent.value]
+        children.sort(key=lambda child: child[0], reverse=True)
+        stack.extend(children)
+
+    return best_length, best_path, np.inf, nodes
+
+# Cheap starting incumbent: greedy nearest-neighbor tour from city 0
+def nearest_neighbor_tour(dist):
+    n = len(dist)
+    path = [0]
+    unvisited = set(range(1, n))
+    while unvisited:
+        last = path[-1]
+        city = min(unvisited, key=lambda c: dist[last, c])
+        path.append(city)
+        unvisited.remove(city)
+    return tuple(path)
+
+# solve TSP with parallel branch and bound and an optional time budget
+def branch_and_bound_tsp(graph, num_processes=None, time_limit=None):
+    """Return (best_distance, best_path, gap).
+
+    The search tree is split into subtrees that a process pool searches
+    depth-first, sharing the best tour length found so far. gap is the
+    proven optimality gap (best - lower bound) / best: 0.0 when the search
+    finished, larger when time_limit (seconds) cut it short.
+    """
+    if num_processes is None:
+        num_processes = cpu_count()
+    n = len(graph)
+    if n <= 2:
+        path = tuple(range(n))
+        return (total_distance(graph, path) if n else 0), path, 0.0
+
+    dist = np.asarray(graph, dtype=np.float64).copy()
+    np.fill_diagonal(dist, np.inf)
+    deadline = None if time_limit is None else time.time() + time_limit
+
+    best_path = nearest_neighbor_tour(dist)
+    best_length = total_distance(dist, best_path)
+    incumbent = Value('d', best_length)
+
+    # Expand the top of the tree best-first until there is work for every process
+    frontier = [(reduced_matrix_bound(dist, (0,), 0.0, list(range(1, n))), (0,), 0.0)]
+    while frontier and len(frontier) < 4 * num_processes and len(frontier[0][1]) < n - 1:
+        bound, path, cost = frontier.pop(0)
+        frontier.extend(child for child in expand(dist, path, cost) if child[0] < best_length)
+        frontier.sort(key=lambda node: node[0])
+
+    unexplored_bound = np.inf
+    with Pool(processes=num_processes, initializer=init_worker,
+              initargs=(dist, incumbent, deadline)) as pool:
+        for length, path, remaining, _ in pool.imap_unordered(search_subtree, frontier):
+            if path is not None and length < best_length:
+                best_length, best_path = length, path
+            unexplored_bound = min(unexplored_bound, remaining)
+
+    best_distance = total_distance(graph, best_path)
+    lower_bound = float(min(unexplored_bound, best_distance))
+    gap = (best_distance - lower_bound) / best_distance if best_distance else 0.0
+    return best_distance, best_path, gap
+
+if __name__ == "__main__":
+    n = int(input("Enter the number of cities: "))
+    time_limit = float(input("Enter the time budget in seconds (0 for none): "))
+
+    # Generate a random distance matrix for the cities
+    graph = [[0 if i == j else random.randint(1, 100) for j in range(n)] for i in range(n)]
+
+    best_distance, best_path, gap = branch_and_bound_tsp(graph, time_limit=time_limit or None)
+
+    print(f"Shortest distance found: {best_distance}")
+    print(f"Best path (city order): {best_path}")
+    print(f"Optimality gap: {gap:.2%}")
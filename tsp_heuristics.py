@@ -0,0 +1,230 @@
+import math
+import random
+import time
+from collections import deque
+import numpy as np
+
+# Build a dist(i, j) function from a distance matrix or an (n, 2) coordinate array
+def distance_function(graph=None, coords=None):
+    if coords is not None:
+        xs = [float(x) for x, _ in coords]
+        ys = [float(y) for _, y in coords]
+        hypot = math.hypot
+        return lambda i, j: hypot(xs[i] - xs[j], ys[i] - ys[j])
+    rows = [list(row) for row in graph]
+    return lambda i, j: rows[i][j]
+
+# k nearest neighbors of every city, nearest first
+def neighbor_lists(graph=None, coords=None, k=8, block_size=512):
+    if coords is not None:
+        points = np.asarray(coords, dtype=np.float64)
+        n = len(points)
+        k = min(k, n - 1)
+        result = np.empty((n, k), dtype=np.int64)
+        norms = (points ** 2).sum(axis=1)
+        # Work in row blocks so the n x n distance matrix is never materialized
+        for start in range(0, n, block_size):
+            block = points[start:start + block_size]
+            # |p - q|^2 = |p|^2 + |q|^2 - 2 p.q, one matrix product per block
+            sq = norms[start:start + block_size, None] + norms[None, :] - 2.0 * (block @ points.T)
+            sq[np.arange(len(block)), np.arange(start, start + len(block))] = np.inf
+            nearest = np.argpartition(sq, k - 1, axis=1)[:, :k] if k < n - 1 else np.argsort(sq, axis=1)[:, :k]
+            order = np.take_along_axis(sq, nearest, axis=1).argsort(axis=1)
+            result[start:start + len(block)] = np.take_along_axis(nearest, order, axis=1)
+        return result.tolist()
+
+    dist = np.asarray(graph, dtype=np.float64).copy()
+    n = len(dist)
+    k = min(k, n - 1)
+    np.fill_diagonal(dist, np.inf)
+    return np.argsort(dist, axis=1, kind='stable')[:, :k].tolist()
+
+# Greedy nearest-neighbor tour; candidate lists first, a full scan only when they run dry
+def nearest_neighbor_tour(n, dist, neighbors, graph=None, coords=None, start=0):
+    visited = np.zeros(n, dtype=bool)
+    tour = [start]
+    visited[start] = True
+    points = None if coords is None else np.asarray(coords, dtype=np.float64)
+    matrix = None if graph is None else np.asarray(graph, dtype=np.float64)
+
+    for _ in range(n - 1):
+        last = tour[-1]
+        city = next((c for c in neighbors[last] if not visited[c]), None)
+        if city is None:
+            if points is not None:
+                scores = ((points - points[last]) ** 2).sum(axis=1)
+            else:
+                scores = matrix[last].copy()
+            scores[visited] = np.inf
+            city = int(scores.argmin())
+        tour.append(city)
+        visited[city] = True
+    return tour
+
+class ArrayTour:
+    """A tour stored as an array plus each city's position, for O(1) succ/pred."""
+
+    def __init__(self, order):
+        self.tour = list(order)
+        self.n = len(self.tour)
+        self.pos = [0] * self.n
+        for i, city in enumerate(self.tour):
+            self.pos[city] = i
+
+    def succ(self, city):
+        return self.tour[(self.pos[city] + 1) % self.n]
+
+    def pred(self, city):
+        return self.tour[self.pos[city] - 1]
+
+    def reverse(self, first, last):
+        """Reverse the path first..last (in tour order); the shorter side is flipped."""
+        tour, pos, n = self.tour, self.pos, self.n
+        i, j = pos[first], pos[last]
+        length = (j - i) % n + 1
+        if 2 * length > n:
+            # Reversing the complement gives the same undirected tour
+            i, j = (j + 1) % n, (i - 1) % n
+            length = n - length
+        for _ in range(length // 2):
+            a, b = tour[i], tour[j]
+            tour[i], pos[b] = b, i
+            tour[j], pos[a] = a, j
+            i = (i + 1) % n
+            j = (j - 1) % n
+
+    def move_segment(self, first, length, after, reverse):
+        """Move the path of length cities starting at first to just after city after."""
+        tour, pos = self.tour, self.pos
+        if pos[first] + length > self.n:
+            # Rotate so the segment does not wrap around the end of the array
+            start = pos[first]
+            self.tour = tour = tour[start:] + tour[:start]
+            for i, city in enumerate(tour):
+                pos[city] = i
+        i = pos[first]
+        segment = tour[i:i + length]
+        del tour[i:i + length]
+        j = pos[after] - length if pos[after] > i else pos[after]
+        tour[j + 1:j + 1] = segment[::-1] if reverse else segment
+        for k in range(min(i, j + 1), max(i + length, j + 1 + length)):
+            pos[tour[k]] = k
+
+# Try 2-opt moves that add an edge from a to one of its candidate neighbors
+def improve_two_opt(t, a, dist, neighbors):
+    for forward in (True, False):
+        b = t.succ(a) if forward else t.pred(a)
+        d_ab = dist(a, b)
+        for c in neighbors[a]:
+            d_ac = dist(a, c)
+            if d_ac >= d_ab:
+                break  # neighbors are sorted, so no later c can gain either
+            d = t.succ(c) if forward else t.pred(c)
+            if c == b or d == a:
+                continue
+            # O(1) delta: replace edges (a, b), (c, d) with (a, c), (b, d)
+            delta = d_ac + dist(b, d) - d_ab - dist(c, d)
+            if delta < -1e-10:
+                if forward:
+                    t.reverse(b, c)
+                else:
+                    t.reverse(c, b)
+                return (a, b, c, d)
+    return None
+
+# Try moving a segment of 1-3 cities starting at a next to one of its neighbors
+def improve_or_opt(t, a, dist, neighbors, max_length=3):
+    n = t.n
+    for length in range(1, min(max_length, n - 3) + 1):
+        segment = [a]
+        for _ in range(length - 1):
+            segment.append(t.succ(segment[-1]))
+        first, last = segment[0], segment[-1]
+        p, nx = t.pred(first), t.succ(last)
+        # What removing the segment and closing the gap saves
+        removal_gain = dist(p, first) + dist(last, nx) - dist(p, nx)
+        if removal_gain <= 1e-10:
+            continue
+
+        inside = set(segment)
+        for end in (first, last):
+            for c in neighbors[end]:
+                if dist(c, end) >= removal_gain:
+                    break
+                if c in inside:
+                    continue
+                for e in (t.succ(c), t.pred(c)):
+                    if e in inside:
+                        continue
+                    # Insert between c and e with end adjacent to c
+                    other = last if end == first else first
+                    delta = dist(c, end) + dist(other, e) - dist(c, e) - removal_gain
+                    if delta < -1e-10:
+                        left, right = (c, e) if e == t.succ(c) else (e, c)
+                        # After left in tour order; the city next to left decides orientation
+                        next_to_left = end if left == c else other
+                        t.move_segment(first, length, left, reverse=(next_to_left != first))
+                        return (p, nx, c, e) + tuple(segment)
+    return None
+
+# Local search with don't-look bits: only cities near a recent change are re-examined
+def local_search(order, dist, neighbors, time_limit=None, use_or_opt=True):
+    t = ArrayTour(order)
+    deadline = None if time_limit is None else time.time() + time_limit
+    queue = deque(t.tour)
+    queued = [True] * t.n
+    checks = 0
+
+    while queue:
+        checks += 1
+        if deadline is not None and checks % 1024 == 0 and time.time() > deadline:
+            break
+        a = queue.popleft()
+        queued[a] = False
+        touched = improve_two_opt(t, a, dist, neighbors)
+        if touched is None and use_or_opt:
+            touched = improve_or_opt(t, a, dist, neighbors)
+        if touched is not None:
+            # Clear the don't-look bits of every endpoint of the move
+            for city in (a,) + touched:
+                if not queued[city]:
+                    queued[city] = True
+                    queue.append(city)
+    return t.tour
+
+# solve large TSP instances heuristically: nearest neighbor, then 2-opt + Or-opt
+def heuristic_tsp(graph=None, coords=None, k=8, time_limit=None, use_or_opt=True):
+    """Return (distance, path) for a distance matrix graph or an (n, 2) coords array.
+
+    The moves assume symmetric distances (as with coordinates). path starts
+    at city 0, like brute_force_tsp.
+    """
+    if (graph is None) == (coords is None):
+        raise ValueError("pass exactly one of graph or coords")
+    n = len(coords) if coords is not None else len(graph)
+    if n == 0:
+        return 0, ()
+    dist = distance_function(graph, coords)
+    if n <= 3:
+        path = tuple(range(n))
+    else:
+        neighbors = neighbor_lists(graph, coords, k)
+        order = nearest_neighbor_tour(n, dist, neighbors, graph, coords)
+        tour = local_search(order, dist, neighbors, time_limit, use_or_opt)
+        start = tour.index(0)
+        path = tuple(tour[start:] + tour[:start])
+
+    distance = sum(dist(path[i], path[i + 1]) for i in range(n - 1)) + dist(path[-1], path[0])
+    return distance, path
+
+if __name__ == "__main__":
+    n = int(input("Enter the number of cities: "))
+
+    # Random cities in the unit square
+    coords = [(random.random(), random.random()) for _ in range(n)]
+
+    start_time = time.time()
+    best_distance, best_path = heuristic_tsp(coords=coords)
+    print(f"Tour length: {best_distance:.4f} ({time.time() - start_time:.2f}s)")
+    if n <= 20:
+        print(f"Path (city order): {best_path}")